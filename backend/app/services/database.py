@@ -4,6 +4,8 @@ Database service for managing multi-database connections and queries
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, date
 from decimal import Decimal
+import hashlib
+import json
 import logging
 from ..database_adapters.adapter_factory import DatabaseAdapterFactory
 from ..models.schemas import DatabaseType
@@ -24,6 +26,13 @@ def serialize_value(value):
     return value
 
 
+def snapshot_digest(snapshot: Dict[str, Any]) -> bytes:
+    """Content digest of a schema snapshot, ignoring when it was taken"""
+    content = {k: v for k, v in snapshot.items() if k != 'timestamp'}
+    payload = json.dumps(content, sort_keys=True, default=serialize_value)
+    return hashlib.blake2b(payload.encode(), digest_size=32).digest()
+
+
 class DatabaseService:
     """Manages database connections and operations using adapter pattern"""
     
@@ -158,9 +167,11 @@ class DatabaseService:
             # Get schema snapshot from adapter
             snapshot = self.adapter.get_schema_snapshot(schema_name)
             
-            # Cache the snapshot
+            # Cache the snapshot with its digest, so callers can tell whether
+            # it changed without comparing the whole structure
             self.schema_snapshots[schema_name] = {
                 'data': snapshot,
+                'digest': snapshot_digest(snapshot),
                 'timestamp': datetime.now()
             }
             
@@ -303,6 +314,11 @@ class DatabaseService:
             logger.error(f"Failed to get schema snapshot for '{schema_name}': {e}")
             raise
     
+    def get_snapshot_version(self, schema_name: str) -> Optional[bytes]:
+        """Digest of the cached snapshot for a schema, or None if not cached"""
+        cached = self.schema_snapshots.get(schema_name)
+        return cached['digest'] if cached else None
+    
     def get_database_snapshot(self) -> Dict[str, Any]:
         """Get complete database schema snapshot including tables and views"""
         if not self.adapter:
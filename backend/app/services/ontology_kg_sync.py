@@ -11,14 +11,41 @@ This enables the knowledge graph to provide ontology-enhanced recommendations.
 """
 
 import logging
-import yaml
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from neo4j import GraphDatabase
 from neo4j.exceptions import ServiceUnavailable
 
+from ..utils.yaml_cache import load_yaml_cached
+
 logger = logging.getLogger(__name__)
 
+# Indexes backing the MERGE/MATCH lookups done during sync; without them
+# every lookup is a label scan
+SYNC_INDEXES = [
+    "CREATE INDEX ontology_db_connection_id IF NOT EXISTS FOR (db:DatabaseConnection) ON (db.id)",
+    "CREATE INDEX ontology_concept_key IF NOT EXISTS FOR (c:Concept) ON (c.name, c.connection)",
+    "CREATE INDEX ontology_property_key IF NOT EXISTS FOR (p:Property) ON (p.name, p.concept)",
+    "CREATE INDEX ontology_synonym_term IF NOT EXISTS FOR (s:Synonym) ON (s.term)",
+    "CREATE INDEX ontology_table_name IF NOT EXISTS FOR (t:Table) ON (t.name)",
+    "CREATE INDEX ontology_column_key IF NOT EXISTS FOR (col:Column) ON (col.name, col.table)",
+]
+
+
+def _load_ontology_file(ontology_file_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Parse one ontology YAML file; runs in a worker process
+    
+    Returns:
+        (ontology_data, None) on success, (None, error message) on failure
+    """
+    try:
+        return load_yaml_cached(ontology_file_path), None
+    except Exception as e:
+        return None, str(e)
+
 
 class OntologyKGSyncService:
     """
@@ -36,6 +63,7 @@ class OntologyKGSyncService:
         self.config = neo4j_config
         self.driver = None
         self.enabled = neo4j_config.get('enabled', False)
+        self._indexes_ready = False
         
         if self.enabled:
             self._connect()
@@ -47,7 +75,13 @@ class OntologyKGSyncService:
             username = self.config.get('username', 'neo4j')
             password = self.config.get('password', 'password')
             
-            self.driver = GraphDatabase.driver(uri, auth=(username, password))
+            # Managed transactions (execute_read/execute_write) retry
+            # transient errors such as deadlocks for up to this long
+            self.driver = GraphDatabase.driver(
+                uri,
+                auth=(username, password),
+                max_transaction_retry_time=self.config.get('max_transaction_retry_time', 30.0)
+            )
             with self.driver.session() as session:
                 session.run("RETURN 1")
             logger.info(f"✅ Ontology sync service connected to Neo4j at {uri}")
@@ -63,6 +97,22 @@ class OntologyKGSyncService:
             self.driver.close()
             logger.info("Ontology sync service connection closed")
     
+    def _ensure_indexes(self):
+        """Create the sync lookup indexes once per service instance"""
+        if self._indexes_ready:
+            return
+        
+        try:
+            with self.driver.session() as session:
+                for statement in SYNC_INDEXES:
+                    session.run(statement).consume()
+            logger.info("📇 Ontology sync indexes ensured")
+        except Exception as e:
+            # Sync still works without them, only slower
+            logger.warning(f"Could not create ontology sync indexes: {e}")
+        
+        self._indexes_ready = True
+    
     def sync_ontology_file(self, ontology_file_path: str) -> Dict[str, Any]:
         """
         Sync a single ontology YAML file to Neo4j
@@ -80,12 +130,38 @@ class OntologyKGSyncService:
             }
         
         try:
-            # Load ontology YAML
-            with open(ontology_file_path, 'r') as f:
-                ontology_data = yaml.safe_load(f)
-            
-            logger.info(f"📖 Loaded ontology from: {ontology_file_path}")
+            # Load ontology YAML (served from the parse cache when unchanged)
+            ontology_data = load_yaml_cached(ontology_file_path)
+        except Exception as e:
+            logger.error(f"❌ Failed to load ontology {ontology_file_path}: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        
+        logger.info(f"📖 Loaded ontology from: {ontology_file_path}")
+        return self.sync_ontology_data(ontology_data, ontology_file_path)
+    
+    def sync_ontology_data(self, ontology_data: Dict[str, Any], ontology_file_path: str) -> Dict[str, Any]:
+        """
+        Sync an already-parsed ontology document to Neo4j
+        
+        Args:
+            ontology_data: Parsed ontology YAML content
+            ontology_file_path: Path the ontology was loaded from (recorded on the connection node)
             
+        Returns:
+            Sync statistics dictionary
+        """
+        if not self.enabled or not self.driver:
+            return {
+                'success': False,
+                'error': 'Neo4j not enabled or not connected'
+            }
+        
+        self._ensure_indexes()
+        
+        try:
             # Extract metadata
             metadata = ontology_data.get('ontology', {}).get('metadata', {})
             connection_id = metadata.get('connection_id', 'unknown')
@@ -436,7 +512,7 @@ class OntologyKGSyncService:
             return {'success': False, 'error': 'Directory not found'}
         
         # Find all ontology YAML files
-        ontology_files = list(ontology_dir.glob('*_ontology_*.yml'))
+        ontology_files = sorted(ontology_dir.glob('*_ontology_*.yml'))
         
         if not ontology_files:
             logger.warning(f"No ontology files found in: {ontology_dir}")
@@ -454,22 +530,32 @@ class OntologyKGSyncService:
             'errors': []
         }
         
-        for ontology_file in ontology_files:
-            logger.info(f"🔄 Syncing: {ontology_file.name}")
+        # Parse files in worker processes (CPU-bound) while Neo4j writes stay
+        # serialized here; map() yields in order, so syncing file N overlaps
+        # parsing of the files after it
+        max_workers = min(len(ontology_files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parsed_files = executor.map(_load_ontology_file, map(str, ontology_files))
             
-            result = self.sync_ontology_file(str(ontology_file))
-            
-            if result.get('success'):
-                aggregated_stats['files_synced'] += 1
-                aggregated_stats['total_concepts'] += result.get('concepts_synced', 0)
-                aggregated_stats['total_mappings'] += result.get('mappings_created', 0)
-                aggregated_stats['total_relationships'] += result.get('relationships_synced', 0)
-            else:
-                aggregated_stats['files_failed'] += 1
-                aggregated_stats['errors'].append({
-                    'file': ontology_file.name,
-                    'error': result.get('error')
-                })
+            for ontology_file, (ontology_data, load_error) in zip(ontology_files, parsed_files):
+                logger.info(f"🔄 Syncing: {ontology_file.name}")
+                
+                if load_error is not None:
+                    result = {'success': False, 'error': load_error}
+                else:
+                    result = self.sync_ontology_data(ontology_data, str(ontology_file))
+                
+                if result.get('success'):
+                    aggregated_stats['files_synced'] += 1
+                    aggregated_stats['total_concepts'] += result.get('concepts_synced', 0)
+                    aggregated_stats['total_mappings'] += result.get('mappings_created', 0)
+                    aggregated_stats['total_relationships'] += result.get('relationships_synced', 0)
+                else:
+                    aggregated_stats['files_failed'] += 1
+                    aggregated_stats['errors'].append({
+                        'file': ontology_file.name,
+                        'error': result.get('error')
+                    })
         
         logger.info(f"✅ Sync complete: {aggregated_stats['files_synced']}/{len(ontology_files)} files synced")
         return aggregated_stats
@@ -646,3 +732,11 @@ def get_ontology_kg_sync_service(config: Dict[str, Any]) -> OntologyKGSyncServic
         neo4j_config = config.get('neo4j', {})
         _ontology_kg_sync_service = OntologyKGSyncService(neo4j_config)
     return _ontology_kg_sync_service
+
+
+def close_ontology_kg_sync_service():
+    """Close and discard the global ontology sync service"""
+    global _ontology_kg_sync_service
+    if _ontology_kg_sync_service is not None:
+        _ontology_kg_sync_service.close()
+        _ontology_kg_sync_service = None
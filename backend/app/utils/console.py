@@ -0,0 +1,34 @@
+"""
+Console Output Helpers
+Shared by the command-line test and diagnostic scripts
+"""
+import io
+import sys
+from contextlib import contextmanager, redirect_stdout
+
+
+class _SuffixBuffer(io.StringIO):
+    """StringIO that appends a fixed suffix to every non-empty write"""
+
+    def __init__(self, suffix: str):
+        super().__init__()
+        self.suffix = suffix
+
+    def write(self, text):
+        return super().write(text + self.suffix if text else text)
+
+
+@contextmanager
+def buffered_output(suffix: str = ""):
+    """
+    Collect everything printed in the block and emit it in one stdout write.
+    suffix is appended to every print's write, e.g. colorama's Style.RESET_ALL
+    to keep autoreset behaviour for the buffered lines.
+    """
+    buf = _SuffixBuffer(suffix) if suffix else io.StringIO()
+    try:
+        with redirect_stdout(buf):
+            yield
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
@@ -0,0 +1,49 @@
+"""
+LLM Test Response Cache
+On-disk cache for the fixed LLM probes in the command-line test scripts.
+A cached answer stands in for a live one, which is only sound for a
+deterministic probe (temperature 0); set LLM_TEST_NOCACHE=1 to bypass it.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+LLM_CACHE_DIR = Path(".llm_test_cache")
+LLM_CACHE_TTL = int(os.getenv("LLM_TEST_CACHE_TTL", 24 * 3600))
+
+
+def active_model(llm_service) -> str:
+    """Model name of the provider the LLMService is currently using"""
+    provider = llm_service.providers.get(llm_service.current_provider)
+    return getattr(provider, 'model', 'unknown')
+
+
+def cached_llm_call(key_data: Dict[str, Any], call: Callable[[], Any]) -> Tuple[Any, bool]:
+    """
+    Return (call(), False) unless a fresh response for key_data is cached on
+    disk, in which case return (cached response, True).
+    
+    Args:
+        key_data: JSON-serializable description of the request; should name
+            the provider, model and prompt, plus a version the caller bumps
+            when its prompt changes
+        call: Blocking function that performs the request
+    """
+    if os.getenv("LLM_TEST_NOCACHE") == "1":
+        return call(), False
+    
+    key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+    cache_file = LLM_CACHE_DIR / f"{key}.json"
+    
+    if cache_file.exists():
+        entry = json.loads(cache_file.read_text())
+        if time.time() - entry["created_at"] < LLM_CACHE_TTL:
+            return entry["result"], True
+    
+    result = call()
+    LLM_CACHE_DIR.mkdir(exist_ok=True)
+    cache_file.write_text(json.dumps({"created_at": time.time(), "result": result}))
+    return result, False
@@ -0,0 +1,87 @@
+"""
+YAML Parse Cache
+Caches parsed YAML documents as JSON on disk, keyed by file content hash
+"""
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# libyaml-backed loader when available, pure-Python loader otherwise
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+CACHE_DIR = Path.home() / '.cache' / 'dbai' / 'yaml'
+
+# In-process memo: resolved path -> ((mtime_ns, size), sha256)
+_digest_memo: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def _content_digest(path: Path) -> Tuple[str, bytes]:
+    """Return (sha256, raw bytes) for a file"""
+    raw = path.read_bytes()
+    return hashlib.sha256(raw).hexdigest(), raw
+
+
+def load_yaml_cached(path: Union[str, Path]) -> Any:
+    """
+    Load a YAML file, reusing a JSON copy of the parsed document when the
+    file content is unchanged.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        Parsed YAML document (same result as yaml.safe_load)
+    """
+    path = Path(path)
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    memo_key = str(path.resolve())
+    
+    raw = None
+    memo = _digest_memo.get(memo_key)
+    if memo and memo[0] == signature:
+        digest = memo[1]
+    else:
+        digest, raw = _content_digest(path)
+        _digest_memo[memo_key] = (signature, digest)
+    
+    cache_file = CACHE_DIR / f"{digest}.json"
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable YAML cache entry {cache_file}: {e}")
+    
+    if raw is None:
+        raw = path.read_bytes()
+    data = yaml.load(raw, Loader=YamlLoader)
+    
+    # Only cache documents that survive a JSON round trip unchanged
+    # (dates, non-string keys, etc. are parsed from YAML every time)
+    try:
+        dumped = json.dumps(data)
+        if json.loads(dumped) == data:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            tmp_file.write_text(dumped, encoding='utf-8')
+            tmp_file.replace(cache_file)
+    except (TypeError, ValueError, OSError) as e:
+        logger.debug(f"Not caching {path}: {e}")
+    
+    return data
+
+
+def invalidate_yaml_cache():
+    """Remove all cached YAML documents"""
+    _digest_memo.clear()
+    if CACHE_DIR.exists():
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        logger.info(f"Cleared YAML cache: {CACHE_DIR}")
@@ -9,17 +9,49 @@ Usage:
     python sync_ontology_to_neo4j.py --file path.yml    # Sync specific file
     python sync_ontology_to_neo4j.py --clear             # Clear graph first
     python sync_ontology_to_neo4j.py --test              # Test connection only
+    python sync_ontology_to_neo4j.py --invalidate-cache  # Re-parse all YAML files
 """
 
 import sys
 import argparse
-import yaml
 from pathlib import Path
 
 # Add backend to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from backend.app.services.ontology_kg_sync import OntologyKGSyncService
+from backend.app.services.ontology_kg_sync import (
+    get_ontology_kg_sync_service,
+    close_ontology_kg_sync_service,
+)
+from backend.app.utils.yaml_cache import load_yaml_cached, invalidate_yaml_cache
+
+
+# Knowledge graph statistics; each is answered from the count store / label index
+STATS_QUERIES = {
+    'node_count': "MATCH (n) RETURN count(n) AS c",
+    'rel_count': "MATCH ()-[r]->() RETURN count(r) AS c",
+    'concept_count': "MATCH (n:Concept) RETURN count(n) AS c",
+    'property_count': "MATCH (n:Property) RETURN count(n) AS c",
+}
+
+# Nodes removed per transaction when clearing the graph
+CLEAR_BATCH_SIZE = 10000
+
+
+# Transaction functions: run through session.execute_read/execute_write so the
+# driver retries them on transient failures (deadlocks, leader switches).
+# Reads and writes are kept in separate transactions.
+def _fetch_count(tx, query):
+    """Return the single count produced by a stats query"""
+    return tx.run(query).single()['c']
+
+
+def _delete_node_batch(tx, batch_size):
+    """Delete up to batch_size nodes (with their relationships); return how many"""
+    return tx.run(
+        "MATCH (n) WITH n LIMIT $batch_size DETACH DELETE n RETURN count(n) AS c",
+        batch_size=batch_size
+    ).single()['c']
 
 
 def load_config():
@@ -36,10 +68,7 @@ def load_config():
     
     print(f"📋 Using config file: {config_file.name}")
     
-    with open(config_file, 'r') as f:
-        config = yaml.safe_load(f)
-    
-    return config
+    return load_yaml_cached(config_file)
 
 
 def test_connection(config):
@@ -59,35 +88,28 @@ def test_connection(config):
         print("   Enable it in config.yml: neo4j.enabled = true")
         return False
     
-    sync_service = OntologyKGSyncService(neo4j_config)
+    sync_service = get_ontology_kg_sync_service(config)
     
     if sync_service.enabled and sync_service.driver:
         print("\n✅ Neo4j connection successful!")
         
-        # Get statistics
+        # Get statistics - one count per query so the server never builds
+        # the node x relationship cartesian product
         try:
-            from neo4j import GraphDatabase
             with sync_service.driver.session() as session:
-                result = session.run("""
-                    MATCH (n)
-                    OPTIONAL MATCH ()-[r]->()
-                    RETURN 
-                        count(DISTINCT n) as node_count,
-                        count(DISTINCT r) as rel_count,
-                        count(DISTINCT CASE WHEN n:Concept THEN n END) as concept_count,
-                        count(DISTINCT CASE WHEN n:Property THEN n END) as property_count
-                """)
-                record = result.single()
+                counts = {
+                    name: session.execute_read(_fetch_count, query)
+                    for name, query in STATS_QUERIES.items()
+                }
                 
                 print(f"\n📊 Current Knowledge Graph Statistics:")
-                print(f"   Total Nodes: {record['node_count']}")
-                print(f"   Total Relationships: {record['rel_count']}")
-                print(f"   Concepts: {record['concept_count']}")
-                print(f"   Properties: {record['property_count']}")
+                print(f"   Total Nodes: {counts['node_count']}")
+                print(f"   Total Relationships: {counts['rel_count']}")
+                print(f"   Concepts: {counts['concept_count']}")
+                print(f"   Properties: {counts['property_count']}")
         except Exception as e:
             print(f"\n⚠️  Could not fetch statistics: {e}")
         
-        sync_service.close()
         return True
     else:
         print("\n❌ Neo4j connection failed")
@@ -106,22 +128,27 @@ def clear_graph(config):
         print("❌ Operation cancelled")
         return False
     
-    neo4j_config = config.get('neo4j', {})
-    sync_service = OntologyKGSyncService(neo4j_config)
+    sync_service = get_ontology_kg_sync_service(config)
     
     if not sync_service.enabled:
         print("❌ Neo4j is not enabled")
         return False
     
     try:
+        # Delete in bounded batches so the server never holds the whole
+        # graph in a single transaction's state
+        total_deleted = 0
         with sync_service.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+            while True:
+                deleted = session.execute_write(_delete_node_batch, CLEAR_BATCH_SIZE)
+                if not deleted:
+                    break
+                total_deleted += deleted
+                print(f"   Deleted {total_deleted} nodes...")
         print("✅ Knowledge Graph cleared successfully")
-        sync_service.close()
         return True
     except Exception as e:
         print(f"❌ Failed to clear graph: {e}")
-        sync_service.close()
         return False
 
 
@@ -135,8 +162,7 @@ def sync_single_file(config, file_path):
         print(f"❌ File not found: {file_path}")
         return False
     
-    neo4j_config = config.get('neo4j', {})
-    sync_service = OntologyKGSyncService(neo4j_config)
+    sync_service = get_ontology_kg_sync_service(config)
     
     if not sync_service.enabled:
         print("❌ Neo4j is not enabled in configuration")
@@ -152,11 +178,9 @@ def sync_single_file(config, file_path):
         print(f"   Columns synced: {result.get('columns_synced', 0)}")
         print(f"   Semantic mappings created: {result.get('mappings_created', 0)}")
         print(f"   Relationships synced: {result.get('relationships_synced', 0)}")
-        sync_service.close()
         return True
     else:
         print(f"\n❌ SYNC FAILED: {result.get('error')}")
-        sync_service.close()
         return False
 
 
@@ -175,8 +199,7 @@ def sync_all_files(config, ontology_dir=None):
         print(f"❌ Ontology directory not found: {ontology_dir}")
         return False
     
-    neo4j_config = config.get('neo4j', {})
-    sync_service = OntologyKGSyncService(neo4j_config)
+    sync_service = get_ontology_kg_sync_service(config)
     
     if not sync_service.enabled:
         print("❌ Neo4j is not enabled in configuration")
@@ -197,11 +220,9 @@ def sync_all_files(config, ontology_dir=None):
             for error in result['errors']:
                 print(f"   - {error['file']}: {error['error']}")
         
-        sync_service.close()
         return True
     else:
         print(f"\n❌ BATCH SYNC FAILED: {result.get('error')}")
-        sync_service.close()
         return False
 
 
@@ -216,6 +237,7 @@ Examples:
   %(prog)s --file ontology.yml       # Sync specific file
   %(prog)s --clear                   # Clear graph first, then sync
   %(prog)s --dir /path/to/ontology   # Sync files from specific directory
+  %(prog)s --invalidate-cache        # Drop cached YAML parses before syncing
         """
     )
     
@@ -243,8 +265,17 @@ Examples:
         help='Test Neo4j connection only (no sync)'
     )
     
+    parser.add_argument(
+        '--invalidate-cache',
+        action='store_true',
+        help='Discard cached YAML parses and re-read every file'
+    )
+    
     args = parser.parse_args()
     
+    if args.invalidate_cache:
+        invalidate_yaml_cache()
+    
     # Load configuration
     print("\n📋 Loading configuration...")
     config = load_config()
@@ -252,36 +283,40 @@ Examples:
     if not config:
         sys.exit(1)
     
-    # Test connection if requested
-    if args.test:
-        success = test_connection(config)
-        sys.exit(0 if success else 1)
-    
-    # Clear graph if requested
-    if args.clear:
-        if not clear_graph(config):
+    try:
+        # Test connection if requested
+        if args.test:
+            success = test_connection(config)
+            sys.exit(0 if success else 1)
+        
+        # Clear graph if requested
+        if args.clear:
+            if not clear_graph(config):
+                sys.exit(1)
+        
+        # Sync files
+        if args.file:
+            # Sync single file
+            success = sync_single_file(config, args.file)
+        else:
+            # Sync all files
+            success = sync_all_files(config, args.dir)
+        
+        if success:
+            print("\n" + "="*80)
+            print("🎉 SYNC COMPLETE!")
+            print("="*80)
+            print("\nYour Knowledge Graph is now enhanced with semantic ontology mappings.")
+            print("The SQL Agent will now receive intelligent column recommendations!")
+            sys.exit(0)
+        else:
+            print("\n" + "="*80)
+            print("❌ SYNC FAILED")
+            print("="*80)
             sys.exit(1)
-    
-    # Sync files
-    if args.file:
-        # Sync single file
-        success = sync_single_file(config, args.file)
-    else:
-        # Sync all files
-        success = sync_all_files(config, args.dir)
-    
-    if success:
-        print("\n" + "="*80)
-        print("🎉 SYNC COMPLETE!")
-        print("="*80)
-        print("\nYour Knowledge Graph is now enhanced with semantic ontology mappings.")
-        print("The SQL Agent will now receive intelligent column recommendations!")
-        sys.exit(0)
-    else:
-        print("\n" + "="*80)
-        print("❌ SYNC FAILED")
-        print("="*80)
-        sys.exit(1)
+    finally:
+        # One driver serves every step above; release it once on exit
+        close_ontology_kg_sync_service()
 
 
 if __name__ == '__main__':
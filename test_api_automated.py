@@ -3,24 +3,68 @@ Automated API Testing Script for DatabaseAI
 Reads queries from TEST_QUERIES.md and tests the API automatically
 """
 
+import io
+import sys
 import requests
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import mmap
+import os
 import time
 import re
+import heapq
 import yaml
-from typing import List, Dict, Tuple
-from datetime import datetime
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from colorama import init, Fore, Back, Style
 
+# orjson serializes results much faster than stdlib json when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# zstandard is only needed for --compress
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+from backend.app.utils.yaml_cache import YamlLoader
+
 # Initialize colorama for colored output
 init(autoreset=True)
 
 # Load database configuration from config.yml
 with open('config.yml', 'r') as f:
-    config = yaml.safe_load(f)
+    config = yaml.load(f, Loader=YamlLoader)
 
 db_config = config['database']
 
+# Query files smaller than this are read directly; mapping them costs more than it saves
+MMAP_MIN_SIZE = 64 * 1024
+
+# Successful query responses, reused across runs only when --cache is given
+QUERY_CACHE_PATH = Path.home() / '.cache' / 'dbai' / 'query_cache.sqlite'
+
+# Pooled HTTP connections kept per host
+HTTP_POOL_SIZE = 32
+
+# Pause (seconds) when the API reports an exhausted rate limit without Retry-After
+RATE_LIMIT_PAUSE = 1.0
+
+# Number of slowest queries listed in the summary
+SLOWEST_COUNT = 5
+
 # Configuration
 API_BASE_URL = "http://localhost:8088/api/v1"
 DB_CONFIG = {
@@ -33,39 +77,149 @@ DB_CONFIG = {
     "docker_container": ""
 }
 
+# Query-file patterns, compiled once. The two extraction patterns run on
+# raw bytes so they can scan an mmap of the file without decoding it whole.
+# Pattern 1: Numbered list "1. Query text"
+NUMBERED_QUERY_RE = re.compile(rb'^\d+\.\s+(.+?)(?=\n\d+\.|$)', re.MULTILINE | re.DOTALL)
+# Pattern 2: "**Query N:** text"
+LABELED_QUERY_RE = re.compile(rb'\*\*Query\s+(\d+):\*\*\s+(.+?)(?=\*\*Query|\Z)', re.IGNORECASE | re.DOTALL)
+MARKDOWN_BOLD_RE = re.compile(r'\*\*.*?\*\*')
+# Line breaks inside a query, LF or CRLF: the file is read as bytes, so there
+# is no universal-newline translation
+NEWLINES_RE = re.compile(r'[\r\n]+')
+
+# Response fields kept for a cached query
+CACHED_FIELDS = ("row_count", "sql_query", "retry_count", "execution_time")
+
+
+class QueryCache:
+    """
+    Persistent cache of successful /query responses, keyed by
+    sha256(question + schema version) so a schema change misses the cache
+    """
+    
+    def __init__(self, path: Path = QUERY_CACHE_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the --concurrency worker threads, guarded by the lock
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_cache "
+                "(hash TEXT PRIMARY KEY, response TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+    
+    @staticmethod
+    def key(question: str, schema_version: str) -> str:
+        """Build the cache key for a question against a schema version"""
+        return hashlib.sha256((question + schema_version).encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached response fields, or None on a miss"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response FROM query_cache WHERE hash = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def put(self, key: str, response: Dict):
+        """Store the response fields for a successful query"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO query_cache (hash, response, ts) VALUES (?, ?, ?)",
+                (key, json.dumps(response), time.time())
+            )
+    
+    def close(self):
+        """Close the cache database"""
+        self.conn.close()
+
+
 class APITester:
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        query_cache: Optional[QueryCache] = None,
+        compress_results: bool = False
+    ):
         self.base_url = base_url
         self.session = requests.Session()
+        self.query_cache = query_cache
+        self.compress_results = compress_results  # write test_results_*.json.zst
+        self.schema_version = None  # set from the connect response
+        self._resume_at = 0.0  # monotonic time before which no query is sent
+        
+        # Keep enough pooled keep-alive connections for --concurrency and
+        # retry connection failures / gateway errors with backoff
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=3, status_forcelist=[502, 503, 504], backoff_factor=0.2)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         self.results = []
         
+        # Summary figures, accumulated as each result comes in
+        self.stats = {"successful": 0, "failed": 0, "cached": 0, "rows": 0, "retries": 0, "time": 0.0}
+        self.failed_results = []
+        self.retried_results = []
+        self.slowest = []  # min-heap of (elapsed_time, seq, result), SLOWEST_COUNT long
+        
+        # Output lines collected inside buffered_output() and written at once
+        self._buffer = io.StringIO()
+        self._buffering = False
+        
+    def _emit(self, text: str = ""):
+        """Write one line of output, or queue it while buffering"""
+        # Reset per line: colorama's autoreset only fires once per write()
+        line = f"{text}{Style.RESET_ALL}\n"
+        if self._buffering:
+            self._buffer.write(line)
+        else:
+            sys.stdout.write(line)
+    
+    @contextmanager
+    def buffered_output(self):
+        """Collect output lines and flush them in a single write on exit"""
+        self._buffering = True
+        try:
+            yield
+        finally:
+            self._buffering = False
+            sys.stdout.write(self._buffer.getvalue())
+            sys.stdout.flush()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+    
     def print_header(self, text: str):
         """Print a formatted header"""
-        print("\n" + "=" * 100)
-        print(f"{Fore.CYAN}{Style.BRIGHT}{text.center(100)}")
-        print("=" * 100)
+        self._emit("\n" + "=" * 100)
+        self._emit(f"{Fore.CYAN}{Style.BRIGHT}{text.center(100)}")
+        self._emit("=" * 100)
     
     def print_subheader(self, text: str):
         """Print a formatted subheader"""
-        print(f"\n{Fore.YELLOW}{Style.BRIGHT}{'─' * 100}")
-        print(f"{Fore.YELLOW}{Style.BRIGHT}{text}")
-        print(f"{Fore.YELLOW}{Style.BRIGHT}{'─' * 100}")
+        self._emit(f"\n{Fore.YELLOW}{Style.BRIGHT}{'─' * 100}")
+        self._emit(f"{Fore.YELLOW}{Style.BRIGHT}{text}")
+        self._emit(f"{Fore.YELLOW}{Style.BRIGHT}{'─' * 100}")
     
     def print_success(self, text: str):
         """Print success message"""
-        print(f"{Fore.GREEN}✓ {text}")
+        self._emit(f"{Fore.GREEN}✓ {text}")
     
     def print_error(self, text: str):
         """Print error message"""
-        print(f"{Fore.RED}✗ {text}")
+        self._emit(f"{Fore.RED}✗ {text}")
     
     def print_info(self, text: str):
         """Print info message"""
-        print(f"{Fore.BLUE}ℹ {text}")
+        self._emit(f"{Fore.BLUE}ℹ {text}")
     
     def print_warning(self, text: str):
         """Print warning message"""
-        print(f"{Fore.YELLOW}⚠ {text}")
+        self._emit(f"{Fore.YELLOW}⚠ {text}")
     
     def connect_database(self) -> bool:
         """Connect to the database"""
@@ -83,6 +237,13 @@ class APITester:
                 if data.get('success'):
                     self.print_success(f"Connected to database: {data['database_info']['database']}")
                     self.print_info(f"Tables: {data['database_info']['table_count']}")
+                    
+                    # Cached answers are only valid for the schema they were produced against
+                    schema = data['database_info'].get('schema')
+                    if schema is not None:
+                        self.schema_version = hashlib.sha256(
+                            json.dumps(schema, sort_keys=True).encode('utf-8')
+                        ).hexdigest()
                     return True
                 else:
                     self.print_error(f"Connection failed: {data.get('message')}")
@@ -95,9 +256,56 @@ class APITester:
             self.print_error(f"Connection error: {e}")
             return False
     
+    def update_pacing(self, response: requests.Response):
+        """Pause further queries when the server signals back-pressure"""
+        delay = 0.0
+        retry_after = response.headers.get('Retry-After')
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                # HTTP-date form
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    delay = RATE_LIMIT_PAUSE
+        elif remaining is not None and remaining.strip() == '0':
+            delay = RATE_LIMIT_PAUSE
+        
+        if delay > 0:
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+    
+    def wait_for_pacing(self):
+        """Sleep until any server-requested pause has elapsed"""
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    
     def test_query(self, query_num: int, query_text: str, max_retries: int = 3) -> Dict:
         """Test a single query"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        
+        cache_key = None
+        if self.query_cache is not None and self.schema_version is not None:
+            cache_key = QueryCache.key(query_text, self.schema_version)
+            cached = self.query_cache.get(cache_key)
+            if cached is not None:
+                return {
+                    "query_num": query_num,
+                    "query_text": query_text,
+                    "status_code": 200,
+                    "elapsed_time": (time.perf_counter_ns() - start_ns) / 1e9,
+                    "success": True,
+                    "error": None,
+                    "cache_hit": True,
+                    **cached
+                }
+        
+        # Hold off if the server asked us to; not counted in the query's time
+        self.wait_for_pacing()
+        start_ns = time.perf_counter_ns()
         
         try:
             response = self.session.post(
@@ -109,7 +317,8 @@ class APITester:
                 timeout=120  # 2 minutes timeout for complex queries
             )
             
-            elapsed_time = time.time() - start_time
+            elapsed_time = (time.perf_counter_ns() - start_ns) / 1e9
+            self.update_pacing(response)
             
             result = {
                 "query_num": query_num,
@@ -120,7 +329,8 @@ class APITester:
                 "row_count": 0,
                 "sql_query": "",
                 "error": None,
-                "retry_count": 0
+                "retry_count": 0,
+                "cache_hit": False
             }
             
             if response.status_code == 200:
@@ -130,13 +340,16 @@ class APITester:
                 result["sql_query"] = data.get("sql_query", "")
                 result["retry_count"] = data.get("retry_count", 0)
                 result["execution_time"] = data.get("execution_time", 0)
+                
+                if cache_key is not None:
+                    self.query_cache.put(cache_key, {field: result[field] for field in CACHED_FIELDS})
             else:
                 result["error"] = response.text
                 
             return result
             
         except Exception as e:
-            elapsed_time = time.time() - start_time
+            elapsed_time = (time.perf_counter_ns() - start_ns) / 1e9
             return {
                 "query_num": query_num,
                 "query_text": query_text,
@@ -146,57 +359,119 @@ class APITester:
                 "row_count": 0,
                 "sql_query": "",
                 "error": str(e),
-                "retry_count": 0
+                "retry_count": 0,
+                "cache_hit": False
             }
     
     def parse_queries_from_md(self, file_path: str) -> List[Tuple[int, str]]:
         """Parse queries from TEST_QUERIES.md file"""
-        queries = []
-        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                    return self._parse_queries(f.read())
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    return self._parse_queries(content)
             
-            # Extract queries - look for numbered patterns like "1. ", "2. ", etc.
-            # or "**Query 1:**", etc.
+        except Exception as e:
+            self.print_error(f"Failed to parse queries: {e}")
+            return []
+    
+    def _parse_queries(self, content) -> List[Tuple[int, str]]:
+        """Extract queries from the raw (bytes or mmap) file content"""
+        queries = []
+        
+        # Extract queries - look for numbered patterns like "1. ", "2. ", etc.
+        # or "**Query 1:**", etc.
+        
+        # Pattern 1: Numbered list "1. Query text"
+        matches1 = NUMBERED_QUERY_RE.finditer(content)
+        
+        for i, match in enumerate(matches1, 1):
+            query_text = match.group(1).decode('utf-8').strip()
+            # Clean up the query text
+            query_text = MARKDOWN_BOLD_RE.sub('', query_text)  # Remove markdown bold
+            query_text = NEWLINES_RE.sub(' ', query_text)  # Replace newlines with space
+            query_text = query_text.strip()
             
-            # Pattern 1: Numbered list "1. Query text"
-            pattern1 = r'^\d+\.\s+(.+?)(?=\n\d+\.|$)'
-            matches1 = re.finditer(pattern1, content, re.MULTILINE | re.DOTALL)
+            if query_text and len(query_text) > 10:  # Valid query
+                queries.append((i, query_text))
+        
+        # If no queries found with pattern 1, try pattern 2
+        if not queries:
+            # Pattern 2: "**Query N:** text"
+            matches2 = LABELED_QUERY_RE.finditer(content)
             
-            for i, match in enumerate(matches1, 1):
-                query_text = match.group(1).strip()
-                # Clean up the query text
-                query_text = re.sub(r'\*\*.*?\*\*', '', query_text)  # Remove markdown bold
-                query_text = re.sub(r'\n+', ' ', query_text)  # Replace newlines with space
+            for match in matches2:
+                query_num = int(match.group(1))
+                query_text = match.group(2).decode('utf-8').strip()
+                query_text = NEWLINES_RE.sub(' ', query_text)
                 query_text = query_text.strip()
                 
-                if query_text and len(query_text) > 10:  # Valid query
-                    queries.append((i, query_text))
-            
-            # If no queries found with pattern 1, try pattern 2
-            if not queries:
-                # Pattern 2: "**Query N:** text"
-                pattern2 = r'\*\*Query\s+(\d+):\*\*\s+(.+?)(?=\*\*Query|\Z)'
-                matches2 = re.finditer(pattern2, content, re.IGNORECASE | re.DOTALL)
-                
-                for match in matches2:
-                    query_num = int(match.group(1))
-                    query_text = match.group(2).strip()
-                    query_text = re.sub(r'\n+', ' ', query_text)
-                    query_text = query_text.strip()
-                    
-                    if query_text and len(query_text) > 10:
-                        queries.append((query_num, query_text))
-            
-            return queries
-            
-        except Exception as e:
-            self.print_error(f"Failed to parse queries: {e}")
-            return []
+                if query_text and len(query_text) > 10:
+                    queries.append((query_num, query_text))
+        
+        return queries
+    
+    def print_query_header(self, query_num: int, query_text: str):
+        """Print the banner shown for each query"""
+        self._emit(f"\n{Fore.CYAN}{'─' * 100}")
+        self._emit(f"{Fore.CYAN}{Style.BRIGHT}Query #{query_num}")
+        self._emit(f"{Fore.WHITE}{query_text[:120]}{'...' if len(query_text) > 120 else ''}")
+        self._emit(f"{Fore.CYAN}{'─' * 100}")
+    
+    def print_query_result(self, result: Dict):
+        """Print the outcome of a single query"""
+        if result.get("cache_hit"):
+            self.print_success(f"Query answered from cache (run without --cache to re-run)")
+            self.print_info(f"   Rows returned: {result['row_count']}")
+            self._emit(f"{Fore.MAGENTA}   SQL: {result['sql_query'][:100]}{'...' if len(result['sql_query']) > 100 else ''}")
+        elif result["success"]:
+            self.print_success(f"Query executed successfully")
+            self.print_info(f"   Rows returned: {result['row_count']}")
+            self.print_info(f"   Total time: {result['elapsed_time']:.2f}s")
+            self.print_info(f"   Execution time: {result.get('execution_time', 0):.3f}s")
+            if result['retry_count'] > 0:
+                self.print_warning(f"   Retries needed: {result['retry_count']}")
+            self._emit(f"{Fore.MAGENTA}   SQL: {result['sql_query'][:100]}{'...' if len(result['sql_query']) > 100 else ''}")
+        else:
+            self.print_error(f"Query failed")
+            self.print_error(f"   Time: {result['elapsed_time']:.2f}s")
+            if result['error']:
+                error_preview = result['error'][:200]
+                self.print_error(f"   Error: {error_preview}{'...' if len(result['error']) > 200 else ''}")
     
-    def run_tests(self, queries: List[Tuple[int, str]]):
-        """Run all tests"""
+    def record_result(self, result: Dict):
+        """Store a query result and fold it into the running summary"""
+        self.results.append(result)
+        
+        if result["success"]:
+            self.stats["successful"] += 1
+            self.stats["rows"] += result["row_count"]
+            if result.get("cache_hit"):
+                self.stats["cached"] += 1
+        else:
+            self.stats["failed"] += 1
+            self.failed_results.append(result)
+        self.stats["retries"] += result["retry_count"]
+        self.stats["time"] += result["elapsed_time"]
+        
+        if result["retry_count"] > 0:
+            self.retried_results.append(result)
+        
+        entry = (result["elapsed_time"], len(self.results), result)
+        if len(self.slowest) < SLOWEST_COUNT:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+    
+    def run_tests(self, queries: List[Tuple[int, str]], concurrency: int = 1):
+        """
+        Run all tests
+        
+        Args:
+            queries: (query_num, query_text) pairs
+            concurrency: Number of queries in flight at once (1 = sequential)
+        """
         self.print_header("AUTOMATED API TESTING - DatabaseAI")
         
         # Connect to database
@@ -209,89 +484,92 @@ class APITester:
         # Test each query
         self.print_subheader(f"Step 2: Testing {len(queries)} Queries")
         
-        for query_num, query_text in queries:
-            print(f"\n{Fore.CYAN}{'─' * 100}")
-            print(f"{Fore.CYAN}{Style.BRIGHT}Query #{query_num}")
-            print(f"{Fore.WHITE}{query_text[:120]}{'...' if len(query_text) > 120 else ''}")
-            print(f"{Fore.CYAN}{'─' * 100}")
-            
-            result = self.test_query(query_num, query_text)
-            self.results.append(result)
+        if concurrency <= 1:
+            for query_num, query_text in queries:
+                with self.buffered_output():
+                    self.print_query_header(query_num, query_text)
+                
+                result = self.test_query(query_num, query_text)
+                self.record_result(result)
+                with self.buffered_output():
+                    self.print_query_result(result)
+        else:
+            self.print_info(f"Running up to {concurrency} queries concurrently")
             
-            if result["success"]:
-                self.print_success(f"Query executed successfully")
-                self.print_info(f"   Rows returned: {result['row_count']}")
-                self.print_info(f"   Total time: {result['elapsed_time']:.2f}s")
-                self.print_info(f"   Execution time: {result.get('execution_time', 0):.3f}s")
-                if result['retry_count'] > 0:
-                    self.print_warning(f"   Retries needed: {result['retry_count']}")
-                print(f"{Fore.MAGENTA}   SQL: {result['sql_query'][:100]}{'...' if len(result['sql_query']) > 100 else ''}")
-            else:
-                self.print_error(f"Query failed")
-                self.print_error(f"   Time: {result['elapsed_time']:.2f}s")
-                if result['error']:
-                    error_preview = result['error'][:200]
-                    self.print_error(f"   Error: {error_preview}{'...' if len(result['error']) > 200 else ''}")
+            # Requests run on worker threads; output stays on this thread so
+            # each query's block is printed whole, in completion order
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [
+                    executor.submit(self.test_query, query_num, query_text)
+                    for query_num, query_text in queries
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    self.record_result(result)
+                    with self.buffered_output():
+                        self.print_query_header(result["query_num"], result["query_text"])
+                        self.print_query_result(result)
             
-            # Small delay between queries
-            time.sleep(0.5)
+            self.results.sort(key=lambda r: r["query_num"])
         
         # Print summary
-        self.print_summary()
+        with self.buffered_output():
+            self.print_summary()
     
     def print_summary(self):
         """Print test summary"""
         self.print_header("TEST SUMMARY")
         
         total = len(self.results)
-        successful = sum(1 for r in self.results if r["success"])
-        failed = total - successful
+        successful = self.stats["successful"]
+        failed = self.stats["failed"]
         
-        total_time = sum(r["elapsed_time"] for r in self.results)
+        total_time = self.stats["time"]
         avg_time = total_time / total if total > 0 else 0
         
-        total_rows = sum(r["row_count"] for r in self.results if r["success"])
-        total_retries = sum(r["retry_count"] for r in self.results)
+        total_rows = self.stats["rows"]
+        total_retries = self.stats["retries"]
         
         # Overall stats
-        print(f"\n{Fore.CYAN}{Style.BRIGHT}Overall Statistics:")
-        print(f"  Total Queries:      {total}")
-        print(f"  {Fore.GREEN}Successful:         {successful} ({successful/total*100:.1f}%)")
-        print(f"  {Fore.RED}Failed:             {failed} ({failed/total*100:.1f}%)")
-        print(f"  {Fore.YELLOW}Total Retries:      {total_retries}")
-        print(f"  {Fore.BLUE}Total Rows:         {total_rows}")
-        print(f"  {Fore.BLUE}Total Time:         {total_time:.2f}s")
-        print(f"  {Fore.BLUE}Average Time:       {avg_time:.2f}s")
+        self._emit(f"\n{Fore.CYAN}{Style.BRIGHT}Overall Statistics:")
+        self._emit(f"  Total Queries:      {total}")
+        self._emit(f"  {Fore.GREEN}Successful:         {successful} ({successful/total*100:.1f}%)")
+        if self.stats["cached"]:
+            # Replayed from an earlier run; the API was not asked again
+            self._emit(f"  {Fore.YELLOW}  from cache:       {self.stats['cached']} (not re-sent to the API)")
+        self._emit(f"  {Fore.RED}Failed:             {failed} ({failed/total*100:.1f}%)")
+        self._emit(f"  {Fore.YELLOW}Total Retries:      {total_retries}")
+        self._emit(f"  {Fore.BLUE}Total Rows:         {total_rows}")
+        self._emit(f"  {Fore.BLUE}Total Time:         {total_time:.2f}s")
+        self._emit(f"  {Fore.BLUE}Average Time:       {avg_time:.2f}s")
         
         # Success rate visualization
-        print(f"\n{Fore.CYAN}{Style.BRIGHT}Success Rate:")
+        self._emit(f"\n{Fore.CYAN}{Style.BRIGHT}Success Rate:")
         success_bar = "█" * int(successful / total * 50) if total > 0 else ""
         fail_bar = "█" * int(failed / total * 50) if total > 0 else ""
-        print(f"  {Fore.GREEN}{success_bar}{Fore.RED}{fail_bar} {successful}/{total}")
+        self._emit(f"  {Fore.GREEN}{success_bar}{Fore.RED}{fail_bar} {successful}/{total}")
         
         # Failed queries detail
         if failed > 0:
-            print(f"\n{Fore.RED}{Style.BRIGHT}Failed Queries:")
-            for r in self.results:
-                if not r["success"]:
-                    print(f"  {Fore.RED}✗ Query #{r['query_num']}: {r['query_text'][:60]}...")
-                    if r['error']:
-                        error_line = r['error'].split('\n')[0][:80]
-                        print(f"    {Fore.YELLOW}Error: {error_line}")
+            self._emit(f"\n{Fore.RED}{Style.BRIGHT}Failed Queries:")
+            for r in sorted(self.failed_results, key=lambda x: x["query_num"]):
+                self._emit(f"  {Fore.RED}✗ Query #{r['query_num']}: {r['query_text'][:60]}...")
+                if r['error']:
+                    error_line = r['error'].split('\n')[0][:80]
+                    self._emit(f"    {Fore.YELLOW}Error: {error_line}")
         
         # Queries with retries
-        queries_with_retries = [r for r in self.results if r["retry_count"] > 0]
-        if queries_with_retries:
-            print(f"\n{Fore.YELLOW}{Style.BRIGHT}Queries that needed retries:")
-            for r in queries_with_retries:
-                print(f"  {Fore.YELLOW}⚠ Query #{r['query_num']}: {r['query_text'][:60]}... ({r['retry_count']} retries)")
+        if self.retried_results:
+            self._emit(f"\n{Fore.YELLOW}{Style.BRIGHT}Queries that needed retries:")
+            for r in sorted(self.retried_results, key=lambda x: x["query_num"]):
+                self._emit(f"  {Fore.YELLOW}⚠ Query #{r['query_num']}: {r['query_text'][:60]}... ({r['retry_count']} retries)")
         
         # Top 5 slowest queries
-        sorted_by_time = sorted(self.results, key=lambda x: x["elapsed_time"], reverse=True)[:5]
-        print(f"\n{Fore.MAGENTA}{Style.BRIGHT}Top 5 Slowest Queries:")
+        sorted_by_time = [entry[2] for entry in sorted(self.slowest, reverse=True)]
+        self._emit(f"\n{Fore.MAGENTA}{Style.BRIGHT}Top {SLOWEST_COUNT} Slowest Queries:")
         for i, r in enumerate(sorted_by_time, 1):
             status = f"{Fore.GREEN}✓" if r["success"] else f"{Fore.RED}✗"
-            print(f"  {i}. {status} Query #{r['query_num']}: {r['elapsed_time']:.2f}s - {r['query_text'][:50]}...")
+            self._emit(f"  {i}. {status} Query #{r['query_num']}: {r['elapsed_time']:.2f}s - {r['query_text'][:50]}...")
         
         # Save results to JSON
         self.save_results()
@@ -301,15 +579,28 @@ class APITester:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"test_results_{timestamp}.json"
         
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "total_queries": len(self.results),
+            "successful": self.stats["successful"],
+            "failed": self.stats["failed"],
+            "results": self.results
+        }
+        
         try:
-            with open(filename, 'w') as f:
-                json.dump({
-                    "timestamp": datetime.now().isoformat(),
-                    "total_queries": len(self.results),
-                    "successful": sum(1 for r in self.results if r["success"]),
-                    "failed": sum(1 for r in self.results if not r["success"]),
-                    "results": self.results
-                }, f, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(report, indent=2).encode('utf-8')
+            
+            if self.compress_results:
+                filename += ".zst"
+                cctx = zstd.ZstdCompressor(level=3, threads=-1)
+                with open(filename, 'wb') as raw, cctx.stream_writer(raw) as f:
+                    f.write(payload)
+            else:
+                with open(filename, 'wb') as f:
+                    f.write(payload)
             
             self.print_success(f"\nResults saved to: {filename}")
         except Exception as e:
@@ -318,7 +609,31 @@ class APITester:
 
 def main():
     """Main function"""
-    tester = APITester(API_BASE_URL)
+    parser = argparse.ArgumentParser(description='Automated API testing for DatabaseAI')
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of queries to run concurrently (default: 1, sequential)'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reuse responses of queries that succeeded in an earlier run instead of '
+             'sending them to the API again (a regression in those queries goes unnoticed)'
+    )
+    parser.add_argument(
+        '--compress',
+        action='store_true',
+        help='Write results as zstd-compressed test_results_*.json.zst (needs zstandard)'
+    )
+    args = parser.parse_args()
+    
+    if args.compress and zstd is None:
+        parser.error("--compress requires the zstandard package (pip install zstandard)")
+    
+    query_cache = QueryCache() if args.cache else None
+    tester = APITester(API_BASE_URL, query_cache=query_cache, compress_results=args.compress)
     
     # Parse queries from TEST_QUERIES.md
     tester.print_header("Parsing Test Queries")
@@ -349,7 +664,10 @@ def main():
         return
     
     # Run tests
-    tester.run_tests(queries)
+    tester.run_tests(queries, concurrency=args.concurrency)
+    
+    if query_cache is not None:
+        query_cache.close()
 
 
 if __name__ == "__main__":
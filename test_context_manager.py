@@ -6,23 +6,153 @@ to ensure it properly adjusts context verbosity.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 # Add backend to path
 backend_path = Path(__file__).parent / "backend"
 sys.path.insert(0, str(backend_path))
 
 from app.services.context_manager import ContextManager, ContextStrategy
+from app.utils.console import buffered_output
 from colorama import Fore, Style, init
 
 init(autoreset=True)
 
+# Pre-built colored status prefixes and rules
+_OK = f"{Fore.GREEN}✓"
+_FAIL = f"{Fore.RED}✗"
+_SEP = "=" * 70
+_CYAN_BAR = f"{Fore.CYAN}{_SEP}"
+_YELLOW_BAR = f"{Fore.YELLOW}{_SEP}"
+
+# Token budgets swept by the generation tests
+TOKEN_BUDGETS = [2000, 4000, 8000, 16000]
+
+
+# Read-only schema fixtures shared by the schema tests (built once at import;
+# ContextManager only reads them)
+_SAMPLE_SCHEMA_FULL = MappingProxyType({
+    'tables': {
+        'users': {
+            'columns': [
+                {'name': 'id', 'type': 'integer', 'primary_key': True, 'nullable': False},
+                {'name': 'username', 'type': 'varchar(50)', 'nullable': False, 'unique': True},
+                {'name': 'email', 'type': 'varchar(100)', 'nullable': False, 'unique': True},
+                {'name': 'created_at', 'type': 'timestamp', 'nullable': False},
+            ],
+            'foreign_keys': []
+        },
+        'orders': {
+            'columns': [
+                {'name': 'id', 'type': 'integer', 'primary_key': True, 'nullable': False},
+                {'name': 'user_id', 'type': 'integer', 'nullable': False},
+                {'name': 'total', 'type': 'numeric(10,2)', 'nullable': False},
+                {'name': 'status', 'type': 'varchar(20)', 'nullable': False},
+            ],
+            'foreign_keys': [
+                {'column': 'user_id', 'foreign_table': 'users', 'foreign_column': 'id'}
+            ]
+        },
+        'products': {
+            'columns': [
+                {'name': 'id', 'type': 'integer', 'primary_key': True, 'nullable': False},
+                {'name': 'name', 'type': 'varchar(100)', 'nullable': False},
+                {'name': 'price', 'type': 'numeric(10,2)', 'nullable': False},
+                {'name': 'stock', 'type': 'integer', 'nullable': False},
+            ],
+            'foreign_keys': []
+        }
+    }
+})
+
+_SAMPLE_SCHEMA_SMALL = MappingProxyType({
+    'tables': {
+        'users': {
+            'columns': [
+                {'name': 'id', 'type': 'integer', 'primary_key': True, 'nullable': False},
+                {'name': 'username', 'type': 'varchar(50)', 'nullable': False, 'unique': True},
+            ],
+            'foreign_keys': []
+        }
+    }
+})
+
+# Estimation / truncation inputs, built once per process
+_TOKEN_ESTIMATION_TEXTS = (
+    ("Short text", "Hello world"),
+    ("Medium text", "SELECT * FROM users WHERE id = 1" * 10),
+    ("Long text", "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 50),
+)
+
+_LONG_TEXT = "This is a test sentence. " * 200  # ~1000 tokens
+
+
+@lru_cache(maxsize=8)
+def get_context_manager(max_tokens):
+    """Shared auto-strategy ContextManager per budget (the tests only read from it)"""
+    return ContextManager(max_tokens=max_tokens, strategy="auto")
+
+
+@lru_cache(maxsize=8)
+def build_system_prompt(max_tokens):
+    """
+    System prompt for the shared manager for max_tokens, built once and reused
+    by every test that needs it (the prompt depends on both the strategy and
+    its budget, so the budget is the cache key)
+    """
+    return get_context_manager(max_tokens).build_system_prompt()
+
+
+def build_combined_context(max_tokens, schema, error_msg, analysis):
+    """
+    Build the system, error and schema sections for max_tokens, in the order
+    SQLAgent's retry prompt places them (it also puts the question between
+    error and schema, which this test has none of), and join them with blank
+    lines; returns (sections, prompt)
+    """
+    cm = get_context_manager(max_tokens)
+    sections = (
+        build_system_prompt(max_tokens),
+        cm.build_error_context(error_msg, analysis, attempt_number=2),
+        cm.build_schema_context(schema),
+    )
+    return sections, "\n\n".join(sections)
+
+
+def binary_search_truncate(cm, text, max_tokens):
+    """
+    Reference truncation: longest prefix of text whose estimate fits
+    max_tokens, found with O(log n) estimate_tokens calls
+    """
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if cm.estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def run_sweep(check, cases):
+    """
+    Run check(case) for every case concurrently and print the returned
+    lines in case order
+    """
+    with ThreadPoolExecutor(max_workers=len(cases)) as executor:
+        for lines in executor.map(check, cases):
+            for line in lines:
+                print(line)
+
 
 def print_section(title):
     """Print a colored section header"""
-    print(f"\n{Fore.CYAN}{'='*70}")
+    print(f"\n{_CYAN_BAR}")
     print(f"{Fore.CYAN}{title}")
-    print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
+    print(f"{_CYAN_BAR}{Style.RESET_ALL}")
 
 
 def test_strategy_selection():
@@ -36,95 +166,75 @@ def test_strategy_selection():
         (16000, ContextStrategy.LARGE),
     ]
     
-    for max_tokens, expected_strategy in test_cases:
-        cm = ContextManager(max_tokens=max_tokens, strategy="auto")
+    def check(case):
+        max_tokens, expected_strategy = case
+        cm = get_context_manager(max_tokens)
+        lines = []
         
         if cm.strategy == expected_strategy:
-            print(f"{Fore.GREEN}✓ {max_tokens} tokens -> {cm.strategy.value} (correct)")
+            lines.append(f"{_OK} {max_tokens} tokens -> {cm.strategy.value} (correct)")
         else:
-            print(f"{Fore.RED}✗ {max_tokens} tokens -> {cm.strategy.value} (expected {expected_strategy.value})")
+            lines.append(f"{_FAIL} {max_tokens} tokens -> {cm.strategy.value} (expected {expected_strategy.value})")
         
         stats = cm.get_context_stats()
-        print(f"  Budget: schema={stats['budgets']['schema']}, "
-              f"error={stats['budgets']['error_context']}, "
-              f"system={stats['budgets']['system_prompt']}")
+        lines.append(f"  Budget: schema={stats['budgets']['schema']}, "
+                     f"error={stats['budgets']['error_context']}, "
+                     f"system={stats['budgets']['system_prompt']}")
+        return lines
+    
+    run_sweep(check, test_cases)
 
 
 def test_system_prompts():
     """Test system prompt generation at different levels"""
     print_section("TEST 2: System Prompt Generation")
     
-    for max_tokens in [2000, 4000, 8000, 16000]:
-        cm = ContextManager(max_tokens=max_tokens, strategy="auto")
-        prompt = cm.build_system_prompt()
+    def check(max_tokens):
+        cm = get_context_manager(max_tokens)
+        prompt = build_system_prompt(max_tokens)
         
         token_count = cm.estimate_tokens(prompt)
         budget = cm.budget.system_prompt
         
-        status = f"{Fore.GREEN}✓" if token_count <= budget else f"{Fore.RED}✗"
-        print(f"\n{status} Strategy: {cm.strategy.value} (max_tokens={max_tokens})")
-        print(f"  Prompt tokens: {token_count} / {budget} budget")
-        print(f"  Prompt length: {len(prompt)} chars")
-        print(f"  Preview: {prompt[:100]}...")
+        status = _OK if token_count <= budget else _FAIL
+        return [
+            f"\n{status} Strategy: {cm.strategy.value} (max_tokens={max_tokens})",
+            f"  Prompt tokens: {token_count} / {budget} budget",
+            f"  Prompt length: {len(prompt)} chars",
+            f"  Preview: {prompt[:100]}...",
+        ]
+    
+    run_sweep(check, TOKEN_BUDGETS)
 
 
 def test_schema_context():
     """Test schema context generation"""
     print_section("TEST 3: Schema Context Generation")
     
-    # Sample schema
-    sample_schema = {
-        'tables': {
-            'users': {
-                'columns': [
-                    {'name': 'id', 'type': 'integer', 'primary_key': True, 'nullable': False},
-                    {'name': 'username', 'type': 'varchar(50)', 'nullable': False, 'unique': True},
-                    {'name': 'email', 'type': 'varchar(100)', 'nullable': False, 'unique': True},
-                    {'name': 'created_at', 'type': 'timestamp', 'nullable': False},
-                ],
-                'foreign_keys': []
-            },
-            'orders': {
-                'columns': [
-                    {'name': 'id', 'type': 'integer', 'primary_key': True, 'nullable': False},
-                    {'name': 'user_id', 'type': 'integer', 'nullable': False},
-                    {'name': 'total', 'type': 'numeric(10,2)', 'nullable': False},
-                    {'name': 'status', 'type': 'varchar(20)', 'nullable': False},
-                ],
-                'foreign_keys': [
-                    {'column': 'user_id', 'foreign_table': 'users', 'foreign_column': 'id'}
-                ]
-            },
-            'products': {
-                'columns': [
-                    {'name': 'id', 'type': 'integer', 'primary_key': True, 'nullable': False},
-                    {'name': 'name', 'type': 'varchar(100)', 'nullable': False},
-                    {'name': 'price', 'type': 'numeric(10,2)', 'nullable': False},
-                    {'name': 'stock', 'type': 'integer', 'nullable': False},
-                ],
-                'foreign_keys': []
-            }
-        }
-    }
+    sample_schema = _SAMPLE_SCHEMA_FULL
     
-    for max_tokens in [2000, 4000, 8000, 16000]:
-        cm = ContextManager(max_tokens=max_tokens, strategy="auto")
+    def check(max_tokens):
+        cm = get_context_manager(max_tokens)
         schema_context = cm.build_schema_context(schema=sample_schema, focused_tables=None)
         
         token_count = cm.estimate_tokens(schema_context)
         budget = cm.budget.schema
         
-        status = f"{Fore.GREEN}✓" if token_count <= budget else f"{Fore.RED}✗"
-        print(f"\n{status} Strategy: {cm.strategy.value} (max_tokens={max_tokens})")
-        print(f"  Schema tokens: {token_count} / {budget} budget")
-        print(f"  Schema length: {len(schema_context)} chars")
+        status = _OK if token_count <= budget else _FAIL
+        lines = [
+            f"\n{status} Strategy: {cm.strategy.value} (max_tokens={max_tokens})",
+            f"  Schema tokens: {token_count} / {budget} budget",
+            f"  Schema length: {len(schema_context)} chars",
+        ]
         
-        # Show first few lines
-        lines = schema_context.split('\n')[:5]
-        print(f"  Preview:")
-        for line in lines:
-            print(f"    {line}")
-        print(f"    ... ({len(schema_context.split(chr(10)))} total lines)")
+        # Show first few lines (split stops after the preview; count the rest)
+        preview = schema_context.split('\n', 5)[:5]
+        total_lines = schema_context.count('\n') + 1
+        preview.append(f"... ({total_lines} total lines)")
+        lines.append("  Preview:\n" + "\n".join(f"    {line}" for line in preview))
+        return lines
+    
+    run_sweep(check, TOKEN_BUDGETS)
 
 
 def test_error_context():
@@ -142,8 +252,8 @@ def test_error_context():
     }
     previous_sql = 'SELECT users.username FROM user WHERE id = 1'
     
-    for max_tokens in [2000, 4000, 8000, 16000]:
-        cm = ContextManager(max_tokens=max_tokens, strategy="auto")
+    def check(max_tokens):
+        cm = get_context_manager(max_tokens)
         error_context = cm.build_error_context(
             error_msg=error_msg,
             analysis=analysis,
@@ -154,25 +264,23 @@ def test_error_context():
         token_count = cm.estimate_tokens(error_context)
         budget = cm.budget.error_context
         
-        status = f"{Fore.GREEN}✓" if token_count <= budget else f"{Fore.RED}✗"
-        print(f"\n{status} Strategy: {cm.strategy.value} (max_tokens={max_tokens})")
-        print(f"  Error context tokens: {token_count} / {budget} budget")
-        print(f"  Preview: {error_context[:150]}...")
+        status = _OK if token_count <= budget else _FAIL
+        return [
+            f"\n{status} Strategy: {cm.strategy.value} (max_tokens={max_tokens})",
+            f"  Error context tokens: {token_count} / {budget} budget",
+            f"  Preview: {error_context[:150]}...",
+        ]
+    
+    run_sweep(check, TOKEN_BUDGETS)
 
 
 def test_token_estimation():
     """Test token estimation accuracy"""
     print_section("TEST 5: Token Estimation")
     
-    test_texts = [
-        ("Short text", "Hello world"),
-        ("Medium text", "SELECT * FROM users WHERE id = 1" * 10),
-        ("Long text", "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 50),
-    ]
-    
-    cm = ContextManager(max_tokens=4000)
+    cm = get_context_manager(4000)
     
-    for name, text in test_texts:
+    for name, text in _TOKEN_ESTIMATION_TEXTS:
         estimated = cm.estimate_tokens(text)
         char_count = len(text)
         ratio = char_count / estimated if estimated > 0 else 0
@@ -187,68 +295,71 @@ def test_truncation():
     """Test text truncation to token limits"""
     print_section("TEST 6: Text Truncation")
     
-    long_text = "This is a test sentence. " * 200  # ~1000 tokens
+    long_text = _LONG_TEXT
     
-    cm = ContextManager(max_tokens=4000)
+    cm = get_context_manager(4000)
+    long_text_tokens = cm.estimate_tokens(long_text)
     
     for max_tokens in [50, 100, 200, 500]:
         truncated = cm.truncate_to_tokens(long_text, max_tokens)
         estimated = cm.estimate_tokens(truncated)
         
-        status = f"{Fore.GREEN}✓" if estimated <= max_tokens else f"{Fore.RED}✗"
+        status = _OK if estimated <= max_tokens else _FAIL
         print(f"\n{status} Truncate to {max_tokens} tokens:")
-        print(f"  Original: {len(long_text)} chars ({cm.estimate_tokens(long_text)} tokens)")
+        print(f"  Original: {len(long_text)} chars ({long_text_tokens} tokens)")
         print(f"  Truncated: {len(truncated)} chars ({estimated} tokens)")
         print(f"  Within budget: {estimated <= max_tokens}")
+        
+        # Cross-check against the binary-search reference; a gap of more than
+        # one token means truncate_to_tokens is leaving budget unused
+        reference = cm.estimate_tokens(binary_search_truncate(cm, long_text, max_tokens))
+        if abs(reference - estimated) > 1:
+            print(f"  {Fore.YELLOW}⚠ Reference truncation: {reference} tokens "
+                  f"(off by {reference - estimated}){Style.RESET_ALL}")
+        else:
+            print(f"  Reference truncation: {reference} tokens (within 1 token)")
 
 
 def test_combined_context():
     """Test full context generation (system + schema + error)"""
     print_section("TEST 7: Combined Context (Real-world Scenario)")
     
-    sample_schema = {
-        'tables': {
-            'users': {
-                'columns': [
-                    {'name': 'id', 'type': 'integer', 'primary_key': True, 'nullable': False},
-                    {'name': 'username', 'type': 'varchar(50)', 'nullable': False, 'unique': True},
-                ],
-                'foreign_keys': []
-            }
-        }
-    }
+    sample_schema = _SAMPLE_SCHEMA_SMALL
     
     error_msg = 'ERROR: column does not exist'
     analysis = {'hints': ['Check column names']}
     
-    for max_tokens in [2000, 4000, 8000]:
-        cm = ContextManager(max_tokens=max_tokens, strategy="auto")
+    def check(max_tokens):
+        cm = get_context_manager(max_tokens)
         
-        system = cm.build_system_prompt()
-        schema = cm.build_schema_context(sample_schema)
-        error = cm.build_error_context(error_msg, analysis, attempt_number=2)
+        (system, error, schema), prompt = build_combined_context(
+            max_tokens, sample_schema, error_msg, analysis
+        )
         
-        total_tokens = (
-            cm.estimate_tokens(system) +
-            cm.estimate_tokens(schema) +
-            cm.estimate_tokens(error)
+        system_tokens, error_tokens, schema_tokens = (
+            cm.estimate_tokens(section) for section in (system, error, schema)
         )
+        total_tokens = cm.estimate_tokens(prompt)
         
-        status = f"{Fore.GREEN}✓" if total_tokens <= max_tokens else f"{Fore.RED}✗"
-        print(f"\n{status} Strategy: {cm.strategy.value} (max_tokens={max_tokens})")
-        print(f"  System prompt: {cm.estimate_tokens(system)} tokens")
-        print(f"  Schema: {cm.estimate_tokens(schema)} tokens")
-        print(f"  Error context: {cm.estimate_tokens(error)} tokens")
-        print(f"  Total: {total_tokens} tokens")
-        print(f"  Budget remaining: {max_tokens - total_tokens} tokens")
-        print(f"  Within limit: {total_tokens <= max_tokens}")
+        status = _OK if total_tokens <= max_tokens else _FAIL
+        return [
+            f"\n{status} Strategy: {cm.strategy.value} (max_tokens={max_tokens})",
+            f"  System prompt: {system_tokens} tokens",
+            f"  Error context: {error_tokens} tokens",
+            f"  Schema: {schema_tokens} tokens",
+            f"  Total: {total_tokens} tokens",
+            f"  Budget remaining: {max_tokens - total_tokens} tokens",
+            f"  Within limit: {total_tokens <= max_tokens}",
+        ]
+    
+    run_sweep(check, [2000, 4000, 8000])
 
 
 def run_all_tests():
     """Run all tests"""
-    print(f"\n{Fore.YELLOW}{'='*70}")
+    print(f"\n{_YELLOW_BAR}")
     print(f"{Fore.YELLOW}Context Manager Test Suite")
-    print(f"{Fore.YELLOW}{'='*70}{Style.RESET_ALL}\n")
+    print(f"{_YELLOW_BAR}{Style.RESET_ALL}\n")
     
     tests = [
         test_strategy_selection,
@@ -262,15 +373,17 @@ def run_all_tests():
     
     for test_func in tests:
         try:
-            test_func()
+            # Reset colors after every write, as colorama's autoreset would
+            with buffered_output(suffix=Style.RESET_ALL):
+                test_func()
         except Exception as e:
-            print(f"\n{Fore.RED}✗ Test failed: {e}{Style.RESET_ALL}")
+            print(f"\n{_FAIL} Test failed: {e}{Style.RESET_ALL}")
             import traceback
             traceback.print_exc()
     
-    print(f"\n{Fore.YELLOW}{'='*70}")
+    print(f"\n{_YELLOW_BAR}")
     print(f"{Fore.YELLOW}All tests completed!")
-    print(f"{Fore.YELLOW}{'='*70}{Style.RESET_ALL}\n")
+    print(f"{_YELLOW_BAR}{Style.RESET_ALL}\n")
 
 
 if __name__ == "__main__":
@@ -4,15 +4,32 @@ Test License Integration between DatabaseAI and License Portal
 """
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+# One keep-alive session for every call in the suite
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+SESSION.headers.update({"Content-Type": "application/json"})
 
 print("=" * 60)
 print("Testing License Portal Integration")
 print("=" * 60)
 
+# Tests 1, 2 and 5 are independent read-only probes: start them together so
+# the suite waits for the slowest one instead of their sum (result() re-raises
+# any request error inside the matching try block below)
+_executor = ThreadPoolExecutor(max_workers=3)
+portal_api_probe = _executor.submit(SESSION.get, "http://localhost:9999/api/health", timeout=5)
+portal_ui_probe = _executor.submit(SESSION.get, "http://localhost:9999", timeout=5)
+backend_probe = _executor.submit(SESSION.get, "http://localhost:80/api/license/server-config", timeout=5)
+_executor.shutdown(wait=False)
+
 # Test 1: Check License Portal API
 print("\n1. Testing License Portal API (port 9999)...")
 try:
-    response = requests.get("http://localhost:9999/api/health", timeout=5)
+    response = portal_api_probe.result()
     if response.status_code == 200:
         print("   ✓ License Portal API is running")
         print(f"   Response: {response.json()}")
@@ -24,7 +41,7 @@ except Exception as e:
 # Test 2: Check License Portal UI
 print("\n2. Testing License Portal UI (port 9999)...")
 try:
-    response = requests.get("http://localhost:9999", timeout=5)
+    response = portal_ui_probe.result()
     if response.status_code == 200:
         print("   ✓ License Portal UI is accessible")
     else:
@@ -40,7 +57,7 @@ try:
         "deployment_id": "test-deployment-12345",
         "license_type": "trial"
     }
-    response = requests.post(
+    response = SESSION.post(
         "http://localhost:9999/api/license/generate",
         json=test_data,
         timeout=5
@@ -55,7 +72,7 @@ try:
         
         # Test 4: Validate the license
         print("\n4. Validating the generated license...")
-        validate_response = requests.post(
+        validate_response = SESSION.post(
             "http://localhost:9999/api/license/validate",
             json={"license_key": license_key},
             timeout=5
@@ -80,7 +97,7 @@ except Exception as e:
 # Test 5: Check DatabaseAI backend
 print("\n5. Testing DatabaseAI Backend (port 80)...")
 try:
-    response = requests.get("http://localhost:80/api/license/server-config", timeout=5)
+    response = backend_probe.result()
     if response.status_code == 200:
         config = response.json()
         print("   ✓ DatabaseAI backend is running")
@@ -2,15 +2,23 @@
 """Quick Neo4j connection test"""
 
 import yaml
+from functools import lru_cache
 from pathlib import Path
 
-try:
-    from neo4j import GraphDatabase
-    
-    # Load config
+from backend.app.utils.yaml_cache import YamlLoader
+
+
+@lru_cache(maxsize=1)
+def load_config():
+    """Load app_config.yml once per process"""
     config_file = Path(__file__).parent / 'app_config.yml'
     with open(config_file, 'r') as f:
-        config = yaml.safe_load(f)
+        return yaml.load(f, Loader=YamlLoader)
+
+
+try:
+    # Load config
+    config = load_config()
     
     neo4j_config = config.get('neo4j', {})
     
@@ -23,22 +31,23 @@ try:
     print(f"  Username: {neo4j_config.get('username')}")
     print(f"  Password: {'*' * len(neo4j_config.get('password', ''))}")
     
-    # Try to connect
+    # Try to connect (driver imported only once the config is known)
+    from neo4j import GraphDatabase
+    
     print(f"\n🔌 Attempting connection...")
     driver = GraphDatabase.driver(
         neo4j_config.get('uri'),
         auth=(neo4j_config.get('username'), neo4j_config.get('password'))
     )
     
-    # Test query
+    # Test query and node count in one round trip, as a retryable read
     with driver.session() as session:
-        result = session.run("RETURN 1 as test")
-        record = result.single()
+        record = session.execute_read(
+            lambda tx: tx.run("MATCH (n) WITH count(n) AS c RETURN 1 AS test, c AS node_count").single()
+        )
         print(f"✅ Connection successful! Test query returned: {record['test']}")
         
         # Check if any data exists
-        result = session.run("MATCH (n) RETURN count(n) as node_count")
-        record = result.single()
         print(f"📊 Current nodes in database: {record['node_count']}")
     
     driver.close()
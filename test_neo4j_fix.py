@@ -9,8 +9,22 @@ from pathlib import Path
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from backend.app.services.ontology_kg_sync import get_ontology_kg_sync_service
 import yaml
+from functools import lru_cache
+
+from backend.app.utils.yaml_cache import YamlLoader
+
+
+@lru_cache(maxsize=1)
+def load_config():
+    """Load config.yml (or app_config.yml) once per process"""
+    config_file = Path(__file__).parent / 'config.yml'
+    if not config_file.exists():
+        config_file = Path(__file__).parent / 'app_config.yml'
+    
+    with open(config_file, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
 
 def test_neo4j_query_fix():
     """Test the fixed Neo4j query"""
@@ -20,12 +34,10 @@ def test_neo4j_query_fix():
     print("="*80)
     
     # Load config
-    config_file = Path(__file__).parent / 'config.yml'
-    if not config_file.exists():
-        config_file = Path(__file__).parent / 'app_config.yml'
+    config = load_config()
     
-    with open(config_file, 'r') as f:
-        config = yaml.safe_load(f)
+    # Deferred: loads the neo4j driver and backend service modules
+    from backend.app.services.ontology_kg_sync import get_ontology_kg_sync_service
     
     # Test connection
     neo4j_config = config.get('neo4j', {})
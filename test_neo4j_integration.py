@@ -5,21 +5,42 @@ Quick test script to verify Neo4j endpoints are working
 """
 import requests
 import json
+from requests.adapters import HTTPAdapter
+
+# orjson pretty-prints responses much faster than stdlib json when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 BASE_URL = "http://localhost:8088/api/v1"
 
+# One keep-alive session for every call in the suite
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+SESSION.headers.update({"Content-Type": "application/json"})
+
+
+def dumps(data):
+    """Pretty-print a JSON-compatible value with 2-space indentation"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2)
+
+
 def test_get_settings():
     """Test getting all settings"""
     print("\n1. Testing GET /settings/all...")
     try:
-        response = requests.get(f"{BASE_URL}/settings/all")
+        response = SESSION.get(f"{BASE_URL}/settings/all")
         print(f"Status: {response.status_code}")
         data = response.json()
         if data.get('success'):
             print("✅ Settings retrieved successfully")
             if 'neo4j' in data.get('settings', {}):
                 print("✅ Neo4j settings found in response")
-                print(f"   Neo4j config: {json.dumps(data['settings']['neo4j'], indent=2)}")
+                print(f"   Neo4j config: {dumps(data['settings']['neo4j'])}")
             else:
                 print("❌ Neo4j settings NOT found in response")
         else:
@@ -31,10 +52,10 @@ def test_neo4j_status():
     """Test Neo4j status endpoint"""
     print("\n2. Testing GET /settings/neo4j/status...")
     try:
-        response = requests.get(f"{BASE_URL}/settings/neo4j/status")
+        response = SESSION.get(f"{BASE_URL}/settings/neo4j/status")
         print(f"Status: {response.status_code}")
         data = response.json()
-        print(f"Response: {json.dumps(data, indent=2)}")
+        print(f"Response: {dumps(data)}")
         if data.get('enabled'):
             print("✅ Neo4j is enabled")
         else:
@@ -59,10 +80,9 @@ def test_update_neo4j_settings():
         }
     }
     try:
-        response = requests.put(
+        response = SESSION.put(
             f"{BASE_URL}/settings/update",
-            json=payload,
-            headers={"Content-Type": "application/json"}
+            json=payload
         )
         print(f"Status: {response.status_code}")
         print(f"Response: {response.text[:500]}")  # First 500 chars
@@ -76,7 +96,7 @@ def test_update_neo4j_settings():
             print(f"❌ HTTP {response.status_code}")
             try:
                 error_data = response.json()
-                print(f"Error details: {json.dumps(error_data, indent=2)}")
+                print(f"Error details: {dumps(error_data)}")
             except:
                 print(f"Error text: {response.text}")
     except Exception as e:
@@ -92,14 +112,13 @@ def test_neo4j_connection():
         "database": "neo4j"
     }
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/settings/neo4j/test",
-            json=payload,
-            headers={"Content-Type": "application/json"}
+            json=payload
         )
         print(f"Status: {response.status_code}")
         data = response.json()
-        print(f"Response: {json.dumps(data, indent=2)}")
+        print(f"Response: {dumps(data)}")
         if data.get('success'):
             print("✅ Connection test successful")
         else:
@@ -2,12 +2,30 @@
 """
 Network Management Database Test Script for Oracle
 Creates 5 interconnected tables with sample data for testing DatabaseAI with Oracle
+
+Usage:
+    python test_network_management_oracle.py           # Load rows through the driver
+    python test_network_management_oracle.py --bulk    # Load rows with SQL*Loader (needs sqlldr on PATH)
 """
 
 import oracledb
 from datetime import datetime, timedelta
+import argparse
+import csv
+import itertools
 import random
 import os
+import re
+import subprocess
+import tempfile
+
+parser = argparse.ArgumentParser(description='Create the Oracle network management test database')
+parser.add_argument(
+    '--bulk',
+    action='store_true',
+    help='Load the sample rows with SQL*Loader direct path instead of executemany'
+)
+args = parser.parse_args()
 
 print("=" * 80)
 print("NETWORK MANAGEMENT DATABASE SETUP - ORACLE")
@@ -20,318 +38,492 @@ ORACLE_CONFIG = {
     'dsn': os.environ.get('ORACLE_DSN', 'localhost:1521/XE')
 }
 
-print(f"\n📋 Connection Configuration:")
-print(f"   • User: {ORACLE_CONFIG['user']}")
-print(f"   • DSN: {ORACLE_CONFIG['dsn']}")
-print()
+# Seed for the generated sample data; set it to reproduce a run exactly
+SAMPLE_SEED = os.environ.get('ORACLE_SAMPLE_SEED')
+
+# Generated row counts (raise them to populate a larger test schema) and the
+# number of rows bound per executemany call
+MAINTENANCE_ROWS = int(os.environ.get('ORACLE_MAINTENANCE_ROWS', 15))
+ALERT_ROWS = int(os.environ.get('ORACLE_ALERT_ROWS', 20))
+BATCH_SIZE = int(os.environ.get('ORACLE_BATCH_SIZE', 1000))
+
+# Session pool sizing (override for concurrent or repeated setup runs)
+ORACLE_POOL_CONFIG = {
+    'min': int(os.environ.get('ORACLE_POOL_MIN', 1)),
+    'max': int(os.environ.get('ORACLE_POOL_MAX', 4)),
+    'increment': 1,
+    # Room for the five INSERTs, the COUNT queries and headroom
+    'stmtcachesize': 40
+}
 
-try:
-    # Connect to Oracle
-    print("🔌 Connecting to Oracle Database...")
-    conn = oracledb.connect(
-        user=ORACLE_CONFIG['user'],
-        password=ORACLE_CONFIG['password'],
-        dsn=ORACLE_CONFIG['dsn']
-    )
-    cursor = conn.cursor()
-    print("   ✓ Connected successfully\n")
+# Sample-data INSERT statements. Kept as constants so every execution reuses
+# the exact same SQL text, which is what the statement cache keys on.
+# APPEND_VALUES makes each executemany a direct-path load (the foreign keys are
+# disabled during the load; Oracle falls back to a conventional insert otherwise).
+# load_rows drops the hint for a table that needs more than one batch.
+INSERT_HARDWARE_INFO_SQL = """
+    INSERT /*+ APPEND_VALUES */ INTO hardware_info (hardware_type, manufacturer, model_number, purchase_date, 
+                               warranty_years, unit_price, supplier)
+    VALUES (:1, :2, :3, :4, :5, :6, :7)
+"""
 
-    # Drop existing tables if they exist
-    print("1. Dropping existing tables (if any)...")
-    drop_tables = [
-        "DROP TABLE network_alerts CASCADE CONSTRAINTS",
-        "DROP TABLE maintenance_logs CASCADE CONSTRAINTS",
-        "DROP TABLE network_devices CASCADE CONSTRAINTS",
-        "DROP TABLE device_status CASCADE CONSTRAINTS",
-        "DROP TABLE hardware_info CASCADE CONSTRAINTS"
-    ]
+INSERT_DEVICE_STATUS_SQL = """
+    INSERT /*+ APPEND_VALUES */ INTO device_status (status_name, status_description, severity_level)
+    VALUES (:1, :2, :3)
+"""
 
-    for drop_query in drop_tables:
-        try:
-            cursor.execute(drop_query)
-            print(f"   ✓ {drop_query}")
-        except oracledb.DatabaseError as e:
-            # Ignore table doesn't exist error
-            if 'ORA-00942' not in str(e):
-                print(f"   ⚠ {drop_query} - {e}")
-
-    # Drop sequences
-    print("\n   Dropping sequences...")
-    drop_sequences = [
-        "DROP SEQUENCE hardware_info_seq",
-        "DROP SEQUENCE device_status_seq",
-        "DROP SEQUENCE network_devices_seq",
-        "DROP SEQUENCE maintenance_logs_seq",
-        "DROP SEQUENCE network_alerts_seq"
-    ]
+INSERT_NETWORK_DEVICES_SQL = """
+    INSERT /*+ APPEND_VALUES */ INTO network_devices (device_name, hardware_id, status_id, ip_address, location,
+                                 floor_number, building, installation_date, last_maintenance_date,
+                                 uptime_hours, cpu_usage_percent, memory_usage_percent, bandwidth_usage_mbps)
+    VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10, :11, :12, :13)
+"""
 
-    for drop_seq in drop_sequences:
-        try:
-            cursor.execute(drop_seq)
-        except:
-            pass
-
-    # Create sequences for auto-increment
-    print("\n2. Creating sequences...")
-    sequences = [
-        "CREATE SEQUENCE hardware_info_seq START WITH 1 INCREMENT BY 1",
-        "CREATE SEQUENCE device_status_seq START WITH 1 INCREMENT BY 1",
-        "CREATE SEQUENCE network_devices_seq START WITH 1 INCREMENT BY 1",
-        "CREATE SEQUENCE maintenance_logs_seq START WITH 1 INCREMENT BY 1",
-        "CREATE SEQUENCE network_alerts_seq START WITH 1 INCREMENT BY 1"
-    ]
+INSERT_MAINTENANCE_LOGS_SQL = """
+    INSERT /*+ APPEND_VALUES */ INTO maintenance_logs (device_id, maintenance_type, maintenance_date, 
+                                 performed_by, duration_hours, cost, description, issues_found,
+                                 actions_taken, next_maintenance_date)
+    VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10)
+"""
 
-    for seq in sequences:
-        cursor.execute(seq)
-        print(f"   ✓ {seq}")
+INSERT_NETWORK_ALERTS_SQL = """
+    INSERT /*+ APPEND_VALUES */ INTO network_alerts (device_id, alert_type, severity, alert_message, alert_timestamp,
+                                acknowledged, acknowledged_by, acknowledged_at, resolved, resolved_at,
+                                resolution_notes)
+    VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10, :11)
+"""
 
-    # Create tables with relationships
-    print("\n3. Creating tables...")
+# Row count per table for the summary, in one round trip
+SUMMARY_COUNTS_SQL = """
+    SELECT label, row_count FROM (
+        SELECT 1 AS pos, 'Hardware Info' AS label, COUNT(*) AS row_count FROM hardware_info
+        UNION ALL SELECT 2, 'Device Status', COUNT(*) FROM device_status
+        UNION ALL SELECT 3, 'Network Devices', COUNT(*) FROM network_devices
+        UNION ALL SELECT 4, 'Maintenance Logs', COUNT(*) FROM maintenance_logs
+        UNION ALL SELECT 5, 'Network Alerts', COUNT(*) FROM network_alerts
+    ) ORDER BY pos
+"""
 
+# Schema DDL, children first for the drops and parents first for the creates
+DROP_TABLES = [
+    "DROP TABLE network_alerts CASCADE CONSTRAINTS",
+    "DROP TABLE maintenance_logs CASCADE CONSTRAINTS",
+    "DROP TABLE network_devices CASCADE CONSTRAINTS",
+    "DROP TABLE device_status CASCADE CONSTRAINTS",
+    "DROP TABLE hardware_info CASCADE CONSTRAINTS"
+]
+
+# Sequences from older versions of this script, before the tables switched to
+# identity columns; dropped so re-runs leave no stale objects behind
+LEGACY_SEQUENCES = [
+    "DROP SEQUENCE hardware_info_seq",
+    "DROP SEQUENCE device_status_seq",
+    "DROP SEQUENCE network_devices_seq",
+    "DROP SEQUENCE maintenance_logs_seq",
+    "DROP SEQUENCE network_alerts_seq"
+]
+
+# Tables in dependency order (parents before children)
+CREATE_TABLES = {
     # Table 1: hardware_info (Parent table)
-    cursor.execute("""
-    CREATE TABLE hardware_info (
-        hardware_id NUMBER PRIMARY KEY,
-        hardware_type VARCHAR2(50) NOT NULL,
-        manufacturer VARCHAR2(100) NOT NULL,
-        model_number VARCHAR2(100) NOT NULL,
-        purchase_date DATE NOT NULL,
-        warranty_years NUMBER DEFAULT 3,
-        unit_price NUMBER(10, 2) NOT NULL,
-        supplier VARCHAR2(100),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    print("   ✓ Created table: hardware_info")
-
+    'hardware_info': """
+        CREATE TABLE hardware_info (
+            hardware_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            hardware_type VARCHAR2(50) NOT NULL,
+            manufacturer VARCHAR2(100) NOT NULL,
+            model_number VARCHAR2(100) NOT NULL,
+            purchase_date DATE NOT NULL,
+            warranty_years NUMBER DEFAULT 3,
+            unit_price NUMBER(10, 2) NOT NULL,
+            supplier VARCHAR2(100),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
     # Table 2: device_status (Reference table)
-    cursor.execute("""
-    CREATE TABLE device_status (
-        status_id NUMBER PRIMARY KEY,
-        status_name VARCHAR2(50) UNIQUE NOT NULL,
-        status_description VARCHAR2(500),
-        severity_level NUMBER CHECK (severity_level BETWEEN 1 AND 5),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    print("   ✓ Created table: device_status")
-
+    'device_status': """
+        CREATE TABLE device_status (
+            status_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            status_name VARCHAR2(50) UNIQUE NOT NULL,
+            status_description VARCHAR2(500),
+            severity_level NUMBER CHECK (severity_level BETWEEN 1 AND 5),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
     # Table 3: network_devices (Main operational table with FKs)
-    cursor.execute("""
-    CREATE TABLE network_devices (
-        device_id NUMBER PRIMARY KEY,
-        device_name VARCHAR2(100) NOT NULL,
-        hardware_id NUMBER REFERENCES hardware_info(hardware_id) ON DELETE CASCADE,
-        status_id NUMBER REFERENCES device_status(status_id) ON DELETE SET NULL,
-        ip_address VARCHAR2(45) UNIQUE NOT NULL,
-        location VARCHAR2(200) NOT NULL,
-        floor_number NUMBER,
-        building VARCHAR2(100),
-        installation_date DATE NOT NULL,
-        last_maintenance_date DATE,
-        uptime_hours NUMBER DEFAULT 0,
-        cpu_usage_percent NUMBER(5, 2),
-        memory_usage_percent NUMBER(5, 2),
-        bandwidth_usage_mbps NUMBER(10, 2),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    print("   ✓ Created table: network_devices")
-
+    'network_devices': """
+        CREATE TABLE network_devices (
+            device_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            device_name VARCHAR2(100) NOT NULL,
+            hardware_id NUMBER CONSTRAINT fk_devices_hardware REFERENCES hardware_info(hardware_id) ON DELETE CASCADE,
+            status_id NUMBER CONSTRAINT fk_devices_status REFERENCES device_status(status_id) ON DELETE SET NULL,
+            ip_address VARCHAR2(45) UNIQUE NOT NULL,
+            location VARCHAR2(200) NOT NULL,
+            floor_number NUMBER,
+            building VARCHAR2(100),
+            installation_date DATE NOT NULL,
+            last_maintenance_date DATE,
+            uptime_hours NUMBER DEFAULT 0,
+            cpu_usage_percent NUMBER(5, 2),
+            memory_usage_percent NUMBER(5, 2),
+            bandwidth_usage_mbps NUMBER(10, 2),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
     # Table 4: maintenance_logs (Historical records with FK to devices)
-    cursor.execute("""
-    CREATE TABLE maintenance_logs (
-        log_id NUMBER PRIMARY KEY,
-        device_id NUMBER REFERENCES network_devices(device_id) ON DELETE CASCADE,
-        maintenance_type VARCHAR2(50) NOT NULL,
-        performed_by VARCHAR2(100) NOT NULL,
-        maintenance_date DATE NOT NULL,
-        duration_hours NUMBER(4, 2),
-        cost NUMBER(10, 2),
-        description VARCHAR2(500),
-        issues_found VARCHAR2(500),
-        actions_taken VARCHAR2(500),
-        next_maintenance_date DATE,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    print("   ✓ Created table: maintenance_logs")
-
+    'maintenance_logs': """
+        CREATE TABLE maintenance_logs (
+            log_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            device_id NUMBER CONSTRAINT fk_maintenance_device REFERENCES network_devices(device_id) ON DELETE CASCADE,
+            maintenance_type VARCHAR2(50) NOT NULL,
+            performed_by VARCHAR2(100) NOT NULL,
+            maintenance_date DATE NOT NULL,
+            duration_hours NUMBER(4, 2),
+            cost NUMBER(10, 2),
+            description VARCHAR2(500),
+            issues_found VARCHAR2(500),
+            actions_taken VARCHAR2(500),
+            next_maintenance_date DATE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
     # Table 5: network_alerts (Alert system with FK to devices)
-    cursor.execute("""
-    CREATE TABLE network_alerts (
-        alert_id NUMBER PRIMARY KEY,
-        device_id NUMBER REFERENCES network_devices(device_id) ON DELETE CASCADE,
-        alert_type VARCHAR2(50) NOT NULL,
-        severity VARCHAR2(20) CHECK (severity IN ('Low', 'Medium', 'High', 'Critical')),
-        alert_message VARCHAR2(500) NOT NULL,
-        alert_timestamp TIMESTAMP NOT NULL,
-        acknowledged NUMBER(1) DEFAULT 0,
-        acknowledged_by VARCHAR2(100),
-        acknowledged_at TIMESTAMP,
-        resolved NUMBER(1) DEFAULT 0,
-        resolved_at TIMESTAMP,
-        resolution_notes VARCHAR2(500),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    print("   ✓ Created table: network_alerts")
+    'network_alerts': """
+        CREATE TABLE network_alerts (
+            alert_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            device_id NUMBER CONSTRAINT fk_alerts_device REFERENCES network_devices(device_id) ON DELETE CASCADE,
+            alert_type VARCHAR2(50) NOT NULL,
+            severity VARCHAR2(20) CHECK (severity IN ('Low', 'Medium', 'High', 'Critical')),
+            alert_message VARCHAR2(500) NOT NULL,
+            alert_timestamp TIMESTAMP NOT NULL,
+            acknowledged NUMBER(1) DEFAULT 0,
+            acknowledged_by VARCHAR2(100),
+            acknowledged_at TIMESTAMP,
+            resolved NUMBER(1) DEFAULT 0,
+            resolved_at TIMESTAMP,
+            resolution_notes VARCHAR2(500),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+}
 
-    # Insert sample data
-    print("\n4. Inserting sample data...")
-
-    # Insert hardware_info (10 records)
-    hardware_data = [
-        ('Router', 'Cisco', 'ISR-4451', datetime(2022, 1, 15), 5, 2500.00, 'TechSupply Inc'),
-        ('Switch', 'HP', 'Aruba-2930F', datetime(2022, 2, 20), 3, 800.00, 'NetGear Supply'),
-        ('Firewall', 'Fortinet', 'FortiGate-100F', datetime(2021, 11, 10), 5, 3500.00, 'SecureNet'),
-        ('Access Point', 'Ubiquiti', 'UAP-AC-PRO', datetime(2022, 3, 5), 2, 150.00, 'Wireless Solutions'),
-        ('Server', 'Dell', 'PowerEdge-R740', datetime(2021, 8, 20), 5, 5000.00, 'Dell Direct'),
-        ('Router', 'Juniper', 'MX204', datetime(2022, 5, 12), 5, 4200.00, 'TechSupply Inc'),
-        ('Switch', 'Cisco', 'Catalyst-9300', datetime(2022, 6, 18), 3, 1200.00, 'NetGear Supply'),
-        ('Firewall', 'Palo Alto', 'PA-220', datetime(2021, 12, 1), 5, 2800.00, 'SecureNet'),
-        ('Access Point', 'Cisco', 'Meraki-MR46', datetime(2022, 7, 22), 3, 600.00, 'Wireless Solutions'),
-        ('Server', 'HP', 'ProLiant-DL380', datetime(2021, 9, 15), 5, 4500.00, 'HP Enterprise')
+# Named foreign keys, switched off around the bulk load
+FOREIGN_KEYS = [
+    ('network_devices', 'fk_devices_hardware'),
+    ('network_devices', 'fk_devices_status'),
+    ('maintenance_logs', 'fk_maintenance_device'),
+    ('network_alerts', 'fk_alerts_device')
+]
+
+
+def build_schema_block(drops, creates):
+    """
+    Wrap the schema DDL in one anonymous PL/SQL block so setup is a single
+    round trip. Each drop runs only if USER_OBJECTS lists the object, so a
+    fresh schema raises no ORA-00942 / ORA-02289 to swallow.
+    """
+    def immediate(ddl):
+        return "EXECUTE IMMEDIATE '" + " ".join(ddl.split()).replace("'", "''") + "';"
+    
+    statements = []
+    for ddl in drops:
+        object_type, object_name = ddl.split()[1:3]
+        statements.append(
+            f"FOR o IN (SELECT 1 FROM user_objects WHERE object_type = '{object_type.upper()}' "
+            f"AND object_name = '{object_name.upper()}') LOOP {immediate(ddl)} END LOOP;"
+        )
+    statements += [immediate(ddl) for ddl in creates]
+    return "BEGIN\n  " + "\n  ".join(statements) + "\nEND;"
+
+
+def set_foreign_keys(cursor, enabled):
+    """
+    Disable the sample schema's foreign keys, or re-enable them without
+    re-checking existing rows (ENABLE NOVALIDATE), in one round trip
+    """
+    action = "ENABLE NOVALIDATE" if enabled else "DISABLE"
+    cursor.execute(build_schema_block([], [
+        f"ALTER TABLE {table} {action} CONSTRAINT {constraint}"
+        for table, constraint in FOREIGN_KEYS
+    ]))
+
+
+def sqlldr_load(insert_sql, rows, workdir):
+    """
+    Load rows with SQL*Loader direct path, using the table and column list of
+    insert_sql (the same statement the driver path executes). Returns the
+    number of rows written.
+    """
+    table, column_list = re.search(r'INTO (\w+) \(([^)]*)\)', insert_sql).groups()
+    columns = [column.strip() for column in column_list.split(',')]
+    
+    # Rows are streamed straight to the data file; datetime columns are noted
+    # on the way and travel as text with an explicit mask
+    data_file = os.path.join(workdir, f'{table}.csv')
+    datetime_columns = set()
+    count = 0
+    with open(data_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        for row in rows:
+            values = []
+            for index, value in enumerate(row):
+                if isinstance(value, datetime):
+                    datetime_columns.add(index)
+                    value = value.strftime('%Y-%m-%d %H:%M:%S')
+                values.append('' if value is None else value)
+            writer.writerow(values)
+            count += 1
+    
+    fields = [
+        f'{column} DATE "YYYY-MM-DD HH24:MI:SS"' if index in datetime_columns else column
+        for index, column in enumerate(columns)
     ]
+    
+    control_file = os.path.join(workdir, f'{table}.ctl')
+    with open(control_file, 'w') as f:
+        f.write(f"LOAD DATA\nINFILE '{data_file}'\nAPPEND INTO TABLE {table}\n"
+                f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"'\n"
+                f"TRAILING NULLCOLS\n({', '.join(fields)})\n")
+    
+    # Credentials go in a parameter file so they never show up in the process list
+    par_file = os.path.join(workdir, f'{table}.par')
+    with open(os.open(par_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+        f.write(f"userid={ORACLE_CONFIG['user']}/{ORACLE_CONFIG['password']}@{ORACLE_CONFIG['dsn']}\n"
+                f"control={control_file}\nlog={os.path.join(workdir, table + '.log')}\n"
+                f"bad={os.path.join(workdir, table + '.bad')}\ndirect=true\nsilent=(header,feedback)\n")
+    
+    subprocess.run(['sqlldr', f'parfile={par_file}'], check=True)
+    return count
+
+
+_pool = None
+
+
+def get_pool():
+    """Get or create the Oracle session pool for ORACLE_CONFIG"""
+    global _pool
+    if _pool is None:
+        _pool = oracledb.create_pool(**ORACLE_CONFIG, **ORACLE_POOL_CONFIG)
+    return _pool
 
-    for hw in hardware_data:
-        cursor.execute("""
-            INSERT INTO hardware_info (hardware_id, hardware_type, manufacturer, model_number, purchase_date, 
-                                       warranty_years, unit_price, supplier)
-            VALUES (hardware_info_seq.NEXTVAL, :1, :2, :3, :4, :5, :6, :7)
-        """, hw)
-    conn.commit()
-    print(f"   ✓ Inserted {len(hardware_data)} records into hardware_info")
-
-    # Insert device_status (5 statuses)
-    status_data = [
-        ('Online', 'Device is operational and responsive', 1),
-        ('Offline', 'Device is not responding', 5),
-        ('Maintenance', 'Device is undergoing scheduled maintenance', 2),
-        ('Warning', 'Device has warning conditions', 3),
-        ('Critical', 'Device has critical issues requiring immediate attention', 5)
-    ]
 
-    for status in status_data:
-        cursor.execute("""
-            INSERT INTO device_status (status_id, status_name, status_description, severity_level)
-            VALUES (device_status_seq.NEXTVAL, :1, :2, :3)
-        """, status)
-    conn.commit()
-    print(f"   ✓ Inserted {len(status_data)} records into device_status")
-
-    # Insert network_devices (10 records)
-    locations = [
-        ('Main Router - Building A', 1, 'Building A'),
-        ('Core Switch - Building A', 1, 'Building A'),
-        ('Main Firewall - DMZ', 0, 'Data Center'),
-        ('WiFi AP - Floor 2 East', 2, 'Building B'),
-        ('Database Server - DC1', 0, 'Data Center'),
-        ('Backup Router - Building B', 1, 'Building B'),
-        ('Distribution Switch - Floor 3', 3, 'Building A'),
-        ('Perimeter Firewall', 0, 'Data Center'),
-        ('WiFi AP - Floor 4 West', 4, 'Building B'),
-        ('Application Server - DC2', 0, 'Data Center')
-    ]
+print(f"\n📋 Connection Configuration:")
+print(f"   • User: {ORACLE_CONFIG['user']}")
+print(f"   • DSN: {ORACLE_CONFIG['dsn']}")
+print()
+
+try:
+    # Connect to Oracle
+    print("🔌 Connecting to Oracle Database...")
+    conn = get_pool().acquire()
+    cursor = conn.cursor()
+    # Fetch up to 500 rows per round trip for any wide SELECT run on this
+    # cursor; prefetchrows is arraysize + 1 so the end of the result set
+    # arrives with the last batch instead of costing an extra empty fetch
+    cursor.arraysize = 500
+    cursor.prefetchrows = 501
+    print("   ✓ Connected successfully\n")
+
+    # Drop and recreate the schema in a single PL/SQL round trip
+    print("1. Recreating schema...")
+    cursor.execute(build_schema_block(DROP_TABLES + LEGACY_SEQUENCES,
+                                      list(CREATE_TABLES.values())))
+    
+    for drop_query in DROP_TABLES:
+        print(f"   ✓ {drop_query}")
+    
+    print("\n2. Created tables:")
+    for name in CREATE_TABLES:
+        print(f"   ✓ Created table: {name}")
 
-    ip_base = "192.168"
-    for i in range(10):
-        hw_id = i + 1
-        status_id = random.choice([1, 1, 1, 1, 4])  # Mostly online, some warnings
-        ip = f"{ip_base}.{i+1}.{random.randint(10, 250)}"
-        location, floor, building = locations[i]
-        install_date = datetime.now() - timedelta(days=random.randint(365, 730))
-        last_maint = datetime.now() - timedelta(days=random.randint(30, 180))
-        uptime = random.randint(100, 10000)
-        cpu = round(random.uniform(10.0, 85.0), 2)
-        memory = round(random.uniform(20.0, 90.0), 2)
-        bandwidth = round(random.uniform(50.0, 950.0), 2)
+    # Insert sample data
+    print("\n3. Inserting sample data...")
+
+    # --bulk hands each table to SQL*Loader; otherwise one executemany per table.
+    # The work directory holds the data files and the credential-bearing
+    # parameter files, so it is removed once the load is over.
+    bulk_tmp = tempfile.TemporaryDirectory(prefix='oracle_bulk_') if args.bulk else None
+    bulk_dir = bulk_tmp.name if bulk_tmp else None
+
+    def load_rows(insert_sql, rows, input_sizes=None):
+        """Load an iterable of rows in BATCH_SIZE chunks; returns the row count"""
+        if bulk_dir:
+            return sqlldr_load(insert_sql, rows, bulk_dir)
+        rows = iter(rows)
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        next_batch = list(itertools.islice(rows, BATCH_SIZE))
+        if next_batch:
+            # A direct-path (APPEND_VALUES) insert must be committed before the
+            # same table can be written again (ORA-12838). A table that spans
+            # several batches is inserted conventionally instead, so the whole
+            # load stays one transaction that commits or rolls back together.
+            insert_sql = insert_sql.replace('/*+ APPEND_VALUES */ ', '')
+        count = 0
+        while batch:
+            # Prepare once per batch, then bind the batch against it
+            cursor.prepare(insert_sql)
+            if input_sizes:
+                cursor.setinputsizes(*input_sizes)
+            cursor.executemany(None, batch)
+            count += len(batch)
+            batch, next_batch = next_batch, list(itertools.islice(rows, BATCH_SIZE))
+        return count
+
+    # Bulk load with the foreign keys off; always switch them back on
+    set_foreign_keys(cursor, enabled=False)
+    try:
+        # Insert hardware_info (10 records)
+        hardware_data = [
+            ('Router', 'Cisco', 'ISR-4451', datetime(2022, 1, 15), 5, 2500.00, 'TechSupply Inc'),
+            ('Switch', 'HP', 'Aruba-2930F', datetime(2022, 2, 20), 3, 800.00, 'NetGear Supply'),
+            ('Firewall', 'Fortinet', 'FortiGate-100F', datetime(2021, 11, 10), 5, 3500.00, 'SecureNet'),
+            ('Access Point', 'Ubiquiti', 'UAP-AC-PRO', datetime(2022, 3, 5), 2, 150.00, 'Wireless Solutions'),
+            ('Server', 'Dell', 'PowerEdge-R740', datetime(2021, 8, 20), 5, 5000.00, 'Dell Direct'),
+            ('Router', 'Juniper', 'MX204', datetime(2022, 5, 12), 5, 4200.00, 'TechSupply Inc'),
+            ('Switch', 'Cisco', 'Catalyst-9300', datetime(2022, 6, 18), 3, 1200.00, 'NetGear Supply'),
+            ('Firewall', 'Palo Alto', 'PA-220', datetime(2021, 12, 1), 5, 2800.00, 'SecureNet'),
+            ('Access Point', 'Cisco', 'Meraki-MR46', datetime(2022, 7, 22), 3, 600.00, 'Wireless Solutions'),
+            ('Server', 'HP', 'ProLiant-DL380', datetime(2021, 9, 15), 5, 4500.00, 'HP Enterprise')
+        ]
+
+        # One array-DML round trip per table instead of one execute() per row
+        load_rows(INSERT_HARDWARE_INFO_SQL, hardware_data)
+        print(f"   ✓ Inserted {len(hardware_data)} records into hardware_info")
+
+        # Insert device_status (5 statuses)
+        status_data = [
+            ('Online', 'Device is operational and responsive', 1),
+            ('Offline', 'Device is not responding', 5),
+            ('Maintenance', 'Device is undergoing scheduled maintenance', 2),
+            ('Warning', 'Device has warning conditions', 3),
+            ('Critical', 'Device has critical issues requiring immediate attention', 5)
+        ]
+
+        load_rows(INSERT_DEVICE_STATUS_SQL, status_data)
+        print(f"   ✓ Inserted {len(status_data)} records into device_status")
+
+        # Insert network_devices (10 records)
+        locations = [
+            ('Main Router - Building A', 1, 'Building A'),
+            ('Core Switch - Building A', 1, 'Building A'),
+            ('Main Firewall - DMZ', 0, 'Data Center'),
+            ('WiFi AP - Floor 2 East', 2, 'Building B'),
+            ('Database Server - DC1', 0, 'Data Center'),
+            ('Backup Router - Building B', 1, 'Building B'),
+            ('Distribution Switch - Floor 3', 3, 'Building A'),
+            ('Perimeter Firewall', 0, 'Data Center'),
+            ('WiFi AP - Floor 4 West', 4, 'Building B'),
+            ('Application Server - DC2', 0, 'Data Center')
+        ]
+
+        # One seeded generator and one clock read for all generated rows
+        rng = random.Random(SAMPLE_SEED)
+        now = datetime.now()
+
+        # Generate column by column, then zip into bind tuples
+        ip_base = "192.168"
+        n = len(locations)
+        device_rows = list(zip(
+            [f"Device-{i:03d}" for i in range(1, n + 1)],
+            range(1, n + 1),
+            rng.choices([1, 1, 1, 1, 4], k=n),  # Mostly online, some warnings
+            [f"{ip_base}.{i}.{rng.randint(10, 250)}" for i in range(1, n + 1)],
+            *zip(*locations),
+            [now - timedelta(days=d) for d in rng.choices(range(365, 731), k=n)],
+            [now - timedelta(days=d) for d in rng.choices(range(30, 181), k=n)],
+            rng.choices(range(100, 10001), k=n),
+            [round(rng.uniform(10.0, 85.0), 2) for _ in range(n)],
+            [round(rng.uniform(20.0, 90.0), 2) for _ in range(n)],
+            [round(rng.uniform(50.0, 950.0), 2) for _ in range(n)]
+        ))
         
-        cursor.execute("""
-            INSERT INTO network_devices (device_id, device_name, hardware_id, status_id, ip_address, location,
-                                         floor_number, building, installation_date, last_maintenance_date,
-                                         uptime_hours, cpu_usage_percent, memory_usage_percent, bandwidth_usage_mbps)
-            VALUES (network_devices_seq.NEXTVAL, :1, :2, :3, :4, :5, :6, :7, :8, :9, :10, :11, :12, :13)
-        """, (f"Device-{i+1:03d}", hw_id, status_id, ip, location, floor, building, 
-              install_date, last_maint, uptime, cpu, memory, bandwidth))
-    conn.commit()
-    print(f"   ✓ Inserted 10 records into network_devices")
-
-    # Insert maintenance_logs (15 records - multiple per device)
-    maintenance_types = ['Routine Check', 'Hardware Upgrade', 'Software Update', 'Emergency Repair', 'Performance Tuning']
-    technicians = ['John Smith', 'Sarah Johnson', 'Mike Davis', 'Lisa Chen', 'Robert Brown']
-
-    for i in range(15):
-        device_id = random.randint(1, 10)
-        maint_type = random.choice(maintenance_types)
-        tech = random.choice(technicians)
-        maint_date = datetime.now() - timedelta(days=random.randint(1, 365))
-        duration = round(random.uniform(0.5, 8.0), 2)
-        cost = round(random.uniform(50.0, 500.0), 2)
-        next_maint = maint_date + timedelta(days=90)
+        load_rows(INSERT_NETWORK_DEVICES_SQL, device_rows)
+        print(f"   ✓ Inserted {len(device_rows)} records into network_devices")
+
+        # Insert maintenance_logs (MAINTENANCE_ROWS records - multiple per device)
+        maintenance_types = ['Routine Check', 'Hardware Upgrade', 'Software Update', 'Emergency Repair', 'Performance Tuning']
+        technicians = ['John Smith', 'Sarah Johnson', 'Mike Davis', 'Lisa Chen', 'Robert Brown']
+
+        def gen_maintenance_rows(total):
+            """Yield maintenance_logs rows, generated column-wise one batch at a time"""
+            for start in range(0, total, BATCH_SIZE):
+                n = min(BATCH_SIZE, total - start)
+                maint_dates = [now - timedelta(days=d) for d in rng.choices(range(1, 366), k=n)]
+                maint_types = rng.choices(maintenance_types, k=n)
+                yield from zip(
+                    rng.choices(range(1, 11), k=n),
+                    maint_types,
+                    maint_dates,
+                    rng.choices(technicians, k=n),
+                    [round(rng.uniform(0.5, 8.0), 2) for _ in range(n)],
+                    [round(rng.uniform(50.0, 500.0), 2) for _ in range(n)],
+                    [f'{maint_type} performed on device' for maint_type in maint_types],
+                    rng.choices(['Minor wear and tear observed', 'No issues found'], k=n),
+                    ['Cleaned and tested all components'] * n,
+                    [maint_date + timedelta(days=90) for maint_date in maint_dates]
+                )
         
-        cursor.execute("""
-            INSERT INTO maintenance_logs (log_id, device_id, maintenance_type, maintenance_date, 
-                                         performed_by, duration_hours, cost, description, issues_found,
-                                         actions_taken, next_maintenance_date)
-            VALUES (maintenance_logs_seq.NEXTVAL, :1, :2, :3, :4, :5, :6, :7, :8, :9, :10)
-        """, (device_id, maint_type, maint_date, tech, duration, cost,
-              f'{maint_type} performed on device',
-              'Minor wear and tear observed' if random.random() > 0.5 else 'No issues found',
-              'Cleaned and tested all components',
-              next_maint))
-    conn.commit()
-    print(f"   ✓ Inserted 15 records into maintenance_logs")
-
-    # Insert network_alerts (20 records)
-    alert_types = ['High CPU Usage', 'Memory Threshold', 'Connection Loss', 'Security Threat', 
-                   'Bandwidth Spike', 'Hardware Failure', 'Temperature Alert', 'Power Fluctuation']
-    severities = ['Low', 'Medium', 'High', 'Critical']
-
-    for i in range(20):
-        device_id = random.randint(1, 10)
-        alert_type = random.choice(alert_types)
-        severity = random.choice(severities)
-        alert_time = datetime.now() - timedelta(hours=random.randint(1, 720))
-        acknowledged = random.choice([1, 1, 0])  # 2/3 acknowledged
-        resolved = acknowledged and random.choice([1, 0])
+        count = load_rows(INSERT_MAINTENANCE_LOGS_SQL, gen_maintenance_rows(MAINTENANCE_ROWS))
+        print(f"   ✓ Inserted {count} records into maintenance_logs")
+
+        # Insert network_alerts (ALERT_ROWS records)
+        alert_types = ['High CPU Usage', 'Memory Threshold', 'Connection Loss', 'Security Threat', 
+                       'Bandwidth Spike', 'Hardware Failure', 'Temperature Alert', 'Power Fluctuation']
+        severities = ['Low', 'Medium', 'High', 'Critical']
+
+        def gen_alert_rows(total):
+            """Yield network_alerts rows, generated column-wise one batch at a time"""
+            for start in range(0, total, BATCH_SIZE):
+                n = min(BATCH_SIZE, total - start)
+                alert_type_col = rng.choices(alert_types, k=n)
+                alert_times = [now - timedelta(hours=h) for h in rng.choices(range(1, 721), k=n)]
+                acknowledged_col = rng.choices([1, 1, 0], k=n)  # 2/3 acknowledged
+                resolved_col = [ack and rng.choice([1, 0]) for ack in acknowledged_col]
+                
+                # Acknowledgement/resolution fields only exist for acknowledged/resolved alerts
+                ack_ats = [alert_time + timedelta(minutes=rng.randint(5, 120)) if ack else None
+                           for alert_time, ack in zip(alert_times, acknowledged_col)]
+                yield from zip(
+                    rng.choices(range(1, 11), k=n),
+                    alert_type_col,
+                    rng.choices(severities, k=n),
+                    [f'{alert_type} detected on device - requires attention' for alert_type in alert_type_col],
+                    alert_times,
+                    acknowledged_col,
+                    [rng.choice(technicians) if ack else None for ack in acknowledged_col],
+                    ack_ats,
+                    resolved_col,
+                    [ack_at + timedelta(minutes=rng.randint(30, 480)) if resolved else None
+                     for ack_at, resolved in zip(ack_ats, resolved_col)],
+                    ['Issue resolved after investigation' if resolved else None for resolved in resolved_col]
+                )
         
-        ack_by = random.choice(technicians) if acknowledged else None
-        ack_at = alert_time + timedelta(minutes=random.randint(5, 120)) if acknowledged else None
-        resolved_at = ack_at + timedelta(minutes=random.randint(30, 480)) if resolved else None
+        # The acknowledgement/resolution columns are NULL in some rows; declare their
+        # types up front so a leading None doesn't fix the bind type for the batch
+        count = load_rows(INSERT_NETWORK_ALERTS_SQL, gen_alert_rows(ALERT_ROWS),
+                          input_sizes=(None, None, None, None, None, None,
+                                       100, oracledb.DB_TYPE_TIMESTAMP, None, oracledb.DB_TYPE_TIMESTAMP, 500))
+        print(f"   ✓ Inserted {count} records into network_alerts")
         
-        cursor.execute("""
-            INSERT INTO network_alerts (alert_id, device_id, alert_type, severity, alert_message, alert_timestamp,
-                                        acknowledged, acknowledged_by, acknowledged_at, resolved, resolved_at,
-                                        resolution_notes)
-            VALUES (network_alerts_seq.NEXTVAL, :1, :2, :3, :4, :5, :6, :7, :8, :9, :10, :11)
-        """, (device_id, alert_type, severity, 
-              f'{alert_type} detected on device - requires attention',
-              alert_time, acknowledged, ack_by, ack_at, resolved, resolved_at,
-              'Issue resolved after investigation' if resolved else None))
-    conn.commit()
-    print(f"   ✓ Inserted 20 records into network_alerts")
+        # One commit for the whole load (a single log sync instead of five)
+        conn.commit()
+    except Exception:
+        # Roll back before the constraint DDL below, which commits implicitly
+        conn.rollback()
+        raise
+    finally:
+        set_foreign_keys(cursor, enabled=True)
+        if bulk_tmp:
+            bulk_tmp.cleanup()
 
     print("\n" + "=" * 80)
     print("DATABASE SETUP COMPLETED SUCCESSFULLY!")
     print("=" * 80)
 
     # Display summary statistics
-    print("\n5. Database Summary:")
-    cursor.execute("SELECT COUNT(*) FROM hardware_info")
-    print(f"   • Hardware Info: {cursor.fetchone()[0]} records")
-
-    cursor.execute("SELECT COUNT(*) FROM device_status")
-    print(f"   • Device Status: {cursor.fetchone()[0]} records")
-
-    cursor.execute("SELECT COUNT(*) FROM network_devices")
-    print(f"   • Network Devices: {cursor.fetchone()[0]} records")
-
-    cursor.execute("SELECT COUNT(*) FROM maintenance_logs")
-    print(f"   • Maintenance Logs: {cursor.fetchone()[0]} records")
-
-    cursor.execute("SELECT COUNT(*) FROM network_alerts")
-    print(f"   • Network Alerts: {cursor.fetchone()[0]} records")
+    print("\n4. Database Summary:")
+    cursor.execute(SUMMARY_COUNTS_SQL)
+    for label, count in cursor:
+        print(f"   • {label}: {count} records")
 
     print("\n" + "=" * 80)
     print("COMPLEX TEST QUERIES FOR DatabaseAI - ORACLE")
@@ -440,9 +632,10 @@ try:
     print("Copy any of the above queries into your DatabaseAI chat interface to test!")
     print("=" * 80)
 
-    # Close connection
+    # Release the session back to the pool, then shut the pool down
     cursor.close()
     conn.close()
+    get_pool().close()
 
     print("\n✅ Test database setup complete! You can now test DatabaseAI with Oracle queries.")
 
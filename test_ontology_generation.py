@@ -5,26 +5,119 @@ Tests the full flow from database schema to ontology creation
 """
 
 import asyncio
+import inspect
 import json
+import logging
 import sys
 import os
+import re
+import time
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import yaml
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
-from app.services.database import DatabaseService
-from app.services.llm import LLMService
-from app.services.dynamic_ontology import DynamicOntologyService
-from app.core.config import load_config
+# Only light helpers are imported here; the database/LLM/ontology services
+# (and the SDKs behind them) are imported where they are first used, so a
+# failing early test doesn't pay for them
+from app.utils.console import buffered_output
+from app.utils.llm_test_cache import active_model, cached_llm_call
+from app.utils.yaml_cache import YamlLoader, load_yaml_cached
+
+# Failures with a stack trace go to stderr through this logger; WARNING keeps
+# the backend services' INFO chatter out of the test output
+logger = logging.getLogger("ontology_test")
+logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
+# Cached LLM probe in test 2 (see app.utils.llm_test_cache)
+LLM_CACHE_VERSION = "1"  # bump when the test prompt changes
+
+# Upper bound for the full ontology generation run in test 3
+ONTOLOGY_TIMEOUT = float(os.getenv("ONTOLOGY_TEST_TIMEOUT", 60))
+
+# Per-test time limits in seconds; a test that runs over counts as failed.
+# The database, LLM and ontology services are synchronous, so the tests run
+# their calls through asyncio.to_thread; otherwise a blocked event loop would
+# never get to enforce the limit. A timed-out call's thread is abandoned, not
+# stopped, and finishes in the background.
+TEST_TIMEOUTS = {
+    "Database Connection": 10,
+    "LLM Structured Generation": 30,
+    "LLM Concurrent Stages": 30,
+    "Ontology Generation": 120,
+    "Ontology Export": 5
+}
+
+
+# OWL class/property tags, counted in one pass over the raw bytes
+_OWL_TAG_RE = re.compile(rb"<owl:(Class|ObjectProperty|DatatypeProperty)\b")
+_OWL_CHUNK_SIZE = 1 << 20
+_OWL_CARRY = 32  # longer than any tag above, so a split tag is seen whole
+
+
+def scan_owl(path):
+    """
+    Stream an OWL file once, counting class/property tags and noting whether
+    the <owl:Ontology and </rdf:RDF> markers appear
+    """
+    counts = {"Class": 0, "ObjectProperty": 0, "DatatypeProperty": 0}
+    has_ontology = has_rdf_end = False
+    rest = b""
+    
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(_OWL_CHUNK_SIZE)
+            buf = rest + chunk
+            # Matches starting in the last _OWL_CARRY bytes are left for the
+            # next round, which sees them again at the front of its buffer
+            limit = len(buf) - _OWL_CARRY if chunk else len(buf)
+            for match in _OWL_TAG_RE.finditer(buf):
+                if match.start() >= limit:
+                    break
+                counts[match.group(1).decode()] += 1
+            has_ontology = has_ontology or buf.find(b"<owl:Ontology") != -1
+            has_rdf_end = has_rdf_end or buf.find(b"</rdf:RDF>") != -1
+            if not chunk:
+                break
+            rest = buf[limit:]
+    
+    return counts, has_ontology and has_rdf_end
+
+
+@lru_cache(maxsize=1)
+def load_config():
+    """Load app_config.yml (the backend's config file) once per process"""
+    config_file = Path(__file__).parent / 'app_config.yml'
+    with open(config_file, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+@lru_cache(maxsize=1)
+def get_llm_service():
+    """LLMService for the app config, built once per process and shared by testers"""
+    from app.services.llm import LLMService
+    return LLMService(load_config())
 
 
 class OntologyTester:
     def __init__(self):
         self.config = load_config()
-        self.db_service = DatabaseService()
-        self.llm_service = LLMService(self.config)
+        self.llm_provider = self.config['llm']['provider']
+        self.llm_model = self.config.get(self.llm_provider, {}).get('model', 'unknown')
+        self.db_service = None
+        self.schema_snapshot = None
         self.ontology_service = None
+        self.ontology_listing = None
+    
+    @property
+    def llm_service(self):
+        """Shared LLMService, built on first use"""
+        return get_llm_service()
         
     async def test_database_connection(self):
         """Test 1: Verify database connection and schema extraction"""
@@ -37,22 +130,24 @@ class OntologyTester:
             "host": os.getenv("DB_HOST", "192.168.1.2"),
             "port": int(os.getenv("DB_PORT", "5432")),
             "database": os.getenv("DB_NAME", "testing"),
-            "user": os.getenv("DB_USER", "postgres"),
+            "username": os.getenv("DB_USER", "postgres"),
             "password": os.getenv("DB_PASSWORD", "postgres")
         }
         
         print(f"\n📡 Connecting to: {connection_params['database']} @ {connection_params['host']}")
         
         try:
+            from app.services.database import DatabaseService
+            self.db_service = DatabaseService()
             self.db_service.set_connection(**connection_params)
-            result = await self.db_service.test_connection()
+            success, message, info = await asyncio.to_thread(self.db_service.test_connection)
             
-            if result["success"]:
+            if success:
                 print(f"✅ Connection successful!")
-                print(f"   Database: {result['database']}")
-                print(f"   Version: {result['version']}")
+                print(f"   Database: {info['database']}")
+                print(f"   Version: {info['version']}")
             else:
-                print(f"❌ Connection failed: {result.get('message')}")
+                print(f"❌ Connection failed: {message}")
                 return False
                 
         except Exception as e:
@@ -62,7 +157,8 @@ class OntologyTester:
         # Get schema snapshot
         print("\n📊 Extracting database schema...")
         try:
-            snapshot = await self.db_service.get_database_snapshot()
+            snapshot = await asyncio.to_thread(self.db_service.get_database_snapshot)
+            self.schema_snapshot = snapshot
             tables = snapshot.get("tables", [])
             
             print(f"✅ Schema extracted successfully!")
@@ -71,7 +167,7 @@ class OntologyTester:
             if tables:
                 print("\n   Sample tables:")
                 for table in tables[:5]:
-                    print(f"     • {table['name']} ({len(table.get('columns', []))} columns)")
+                    print(f"     • {table['table_name']} ({len(table.get('columns', []))} columns)")
             else:
                 print("   ⚠️  No tables found in schema!")
                 return False
@@ -83,17 +179,69 @@ class OntologyTester:
             return False
     
     async def test_llm_structured_generation(self):
-        """Test 2: Verify LLM can generate structured JSON"""
+        """
+        Test 2: Verify LLM can generate structured JSON. The method check and
+        the offline parsing check always run; the live call only runs with
+        RUN_LIVE_LLM=1.
+        """
         print("\n" + "="*60)
         print("TEST 2: LLM Structured JSON Generation")
         print("="*60)
         
-        # Check if generate_structured exists
-        if not hasattr(self.llm_service, 'generate_structured'):
+        if not self._test_llm_signature():
+            return False
+        
+        if not await self._test_llm_offline_parse():
+            return False
+        
+        if os.getenv("RUN_LIVE_LLM") != "1":
+            print("\n⏭️  Skipping live LLM call (set RUN_LIVE_LLM=1 to run it)")
+            return True
+        
+        return await self._test_llm_live()
+    
+    def _test_llm_signature(self):
+        """Check that LLMService exposes generate_structured"""
+        method = getattr(self.llm_service, 'generate_structured', None)
+        if not callable(method):
             print("❌ LLMService does not have 'generate_structured' method!")
             print("   This method needs to be added to backend/app/services/llm.py")
             return False
         
+        kind = "async" if inspect.iscoroutinefunction(method) else "sync"
+        print(f"✅ generate_structured is available ({kind})")
+        return True
+    
+    async def _test_llm_offline_parse(self):
+        """Run generate_structured's JSON parsing on a canned fenced reply, without the network"""
+        fixture = ('Here you go:\n```json\n'
+                   '[{"name": "Customer", "confidence": 0.95}, {"name": "Order", "confidence": 0.90}]'
+                   '\n```')
+        reply = mock.Mock(**{"json.return_value": {"message": {"content": fixture}}})
+        offline_provider = SimpleNamespace(model="offline", temperature=0, api_url="http://offline.invalid")
+        messages = [{"role": "user", "content": "offline parse check"}]
+        
+        print("\n🧪 Checking structured parsing offline (fenced JSON fixture)...")
+        try:
+            with mock.patch.object(self.llm_service, "current_provider", "ollama"), \
+                    mock.patch.dict(self.llm_service.providers, {"ollama": offline_provider}), \
+                    mock.patch("app.services.llm.requests.post", return_value=reply):
+                result = self.llm_service.generate_structured(messages, max_tokens=64)
+                if inspect.isawaitable(result):
+                    result = await result
+        except Exception as e:
+            print(f"❌ Offline parse failed: {e}")
+            return False
+        
+        if not (isinstance(result, list) and [c.get("name") for c in result] == ["Customer", "Order"]):
+            print(f"❌ Offline parse returned unexpected data: {result!r}")
+            return False
+        
+        print("✅ Fenced JSON parsed into 2 concepts")
+        return True
+    
+    async def _test_llm_live(self):
+        """Send the fixed probe prompt to the configured LLM"""
         # Simple test prompt
         test_messages = [
             {"role": "system", "content": "You are a helpful assistant. Return only valid JSON."},
@@ -115,12 +263,22 @@ Format:
 Return ONLY valid JSON, no markdown, no explanation."""}
         ]
         
-        print("\n🤖 Testing LLM structured generation...")
-        print(f"   Provider: {self.config['llm']['provider']}")
-        print(f"   Model: {self.config.get(self.config['llm']['provider'], {}).get('model', 'unknown')}")
+        print("\n🤖 Testing live LLM structured generation...")
+        print(f"   Provider: {self.llm_provider}")
+        print(f"   Model: {self.llm_model}")
         
         try:
-            result = await self.llm_service.generate_structured(test_messages, max_tokens=512)
+            result, from_cache = await asyncio.to_thread(
+                cached_llm_call,
+                {"template_version": LLM_CACHE_VERSION,
+                 "provider": self.llm_service.current_provider,
+                 "model": active_model(self.llm_service),
+                 "messages": test_messages, "max_tokens": 512},
+                lambda: self.llm_service.generate_structured(test_messages, max_tokens=512)
+            )
+            
+            if from_cache:
+                print("   ↺ Replayed from .llm_test_cache (LLM not called; LLM_TEST_NOCACHE=1 to bypass)")
             
             if isinstance(result, (list, dict)):
                 print(f"✅ LLM returned valid structured data!")
@@ -138,6 +296,57 @@ Return ONLY valid JSON, no markdown, no explanation."""}
             print(f"❌ Exception during LLM generation: {e}")
             return False
     
+    async def _timed(self, awaitable):
+        """Await awaitable and return (result, elapsed seconds)"""
+        start = time.perf_counter()
+        result = await awaitable
+        return result, time.perf_counter() - start
+    
+    async def test_llm_concurrent_stages(self):
+        """Test 2b: Independent LLM prompts overlap instead of running back to back"""
+        print("\n" + "="*60)
+        print("TEST 2b: Concurrent LLM Stages")
+        print("="*60)
+        
+        system = {"role": "system", "content": "You are a helpful assistant. Return only valid JSON."}
+        stage_prompts = {
+            "concepts": 'List 2 business concepts in a retail database as a JSON array of {"name": ...}.',
+            "properties": 'List 2 properties of a Customer as a JSON array of {"name": ..., "type": ...}.',
+            "relationships": 'List 1 relationship between Customer and Order as a JSON array of '
+                             '{"from": ..., "to": ..., "type": ...}.'
+        }
+        
+        print(f"\n🤖 Submitting {len(stage_prompts)} stage prompts together...")
+        try:
+            # generate_structured blocks on its HTTP request, so each stage
+            # runs on its own worker thread
+            start = time.perf_counter()
+            timed = await asyncio.gather(*(
+                self._timed(asyncio.to_thread(
+                    self.llm_service.generate_structured,
+                    [system, {"role": "user", "content": prompt}], max_tokens=256
+                ))
+                for prompt in stage_prompts.values()
+            ))
+            wall_clock = time.perf_counter() - start
+        except Exception as e:
+            print(f"❌ Exception during concurrent LLM generation: {e}")
+            return False
+        
+        for stage, (_, elapsed) in zip(stage_prompts, timed):
+            print(f"   {stage}: {elapsed:.2f}s")
+        sum_of_stages = sum(elapsed for _, elapsed in timed)
+        print(f"   Wall clock: {wall_clock:.2f}s (sum of stages: {sum_of_stages:.2f}s)")
+        
+        # Overlapped stages finish close to the slowest one; serialized
+        # stages take about their sum
+        if wall_clock > 0.75 * sum_of_stages:
+            print("❌ LLM stages ran one after another, not concurrently")
+            return False
+        
+        print("✅ LLM stages overlapped")
+        return True
+    
     async def test_ontology_generation(self):
         """Test 3: Generate actual ontology from database"""
         print("\n" + "="*60)
@@ -147,9 +356,9 @@ Return ONLY valid JSON, no markdown, no explanation."""}
         # Initialize ontology service
         print("\n🧬 Initializing Dynamic Ontology Service...")
         try:
+            from app.services.dynamic_ontology import DynamicOntologyService
             self.ontology_service = DynamicOntologyService(
                 llm_service=self.llm_service,
-                db_service=self.db_service,
                 config=self.config
             )
             print("✅ Ontology service initialized")
@@ -160,7 +369,13 @@ Return ONLY valid JSON, no markdown, no explanation."""}
         # Generate ontology
         print("\n🔄 Generating ontology...")
         try:
-            ontology = await self.ontology_service.generate_ontology()
+            ontology, elapsed = await self._timed(
+                asyncio.wait_for(
+                    asyncio.to_thread(self.ontology_service.generate_ontology, self.schema_snapshot),
+                    timeout=ONTOLOGY_TIMEOUT
+                )
+            )
+            print(f"   Generation took {elapsed:.2f}s")
             
             # Validate structure
             if not ontology:
@@ -171,35 +386,63 @@ Return ONLY valid JSON, no markdown, no explanation."""}
             properties = ontology.get("properties", [])
             relationships = ontology.get("relationships", [])
             
-            print(f"\n✅ Ontology generated successfully!")
-            print(f"   Concepts: {len(concepts)}")
-            print(f"   Properties: {len(properties)}")
-            print(f"   Relationships: {len(relationships)}")
-            
-            # Show sample concepts
-            if concepts:
-                print("\n   Sample concepts:")
-                for concept in concepts[:3]:
-                    print(f"     • {concept.get('name', 'unnamed')} (confidence: {concept.get('confidence', 0):.2f})")
-                    if 'tables' in concept:
-                        print(f"       Tables: {', '.join(concept['tables'])}")
-            else:
-                print("\n   ⚠️  No concepts generated!")
-            
-            # Show sample relationships
-            if relationships:
-                print("\n   Sample relationships:")
-                for rel in relationships[:3]:
-                    print(f"     • {rel.get('from_concept')} → {rel.get('to_concept')} ({rel.get('relationship_type')})")
+            # The report is short; write it in one go
+            with buffered_output():
+                print(f"\n✅ Ontology generated successfully!")
+                print(f"   Concepts: {len(concepts)}")
+                print(f"   Properties: {len(properties)}")
+                print(f"   Relationships: {len(relationships)}")
+                
+                # Show sample concepts
+                if concepts:
+                    print("\n   Sample concepts:")
+                    for concept in concepts[:3]:
+                        print(f"     • {concept.get('name', 'unnamed')} (confidence: {concept.get('confidence', 0):.2f})")
+                        if 'tables' in concept:
+                            print(f"       Tables: {', '.join(concept['tables'])}")
+                else:
+                    print("\n   ⚠️  No concepts generated!")
+                
+                # Show sample relationships
+                if relationships:
+                    print("\n   Sample relationships:")
+                    for rel in relationships[:3]:
+                        print(f"     • {rel.get('from_concept')} → {rel.get('to_concept')} ({rel.get('relationship_type')})")
             
             return len(concepts) > 0
             
+        except asyncio.TimeoutError:
+            print(f"❌ Ontology generation did not finish within {ONTOLOGY_TIMEOUT:.0f}s")
+            return False
         except Exception as e:
-            print(f"❌ Failed to generate ontology: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Failed to generate ontology: %s", e)
             return False
     
+    def _prescan_ontology_dir(self, ontology_dir=Path("ontology")):
+        """
+        Find the newest exported YAML/OWL file and the number of each in one
+        scandir pass, along with the directory mtime
+        """
+        if not ontology_dir.exists():
+            return None
+        
+        listing = {"mtime": ontology_dir.stat().st_mtime_ns}
+        latest = {".yml": (None, -1), ".owl": (None, -1)}
+        counts = dict.fromkeys(latest, 0)
+        with os.scandir(ontology_dir) as entries:
+            for entry in entries:
+                suffix = os.path.splitext(entry.name)[1]
+                if suffix not in latest or not entry.is_file(follow_symlinks=False):
+                    continue
+                counts[suffix] += 1
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+                if mtime > latest[suffix][1]:
+                    latest[suffix] = (Path(entry.path), mtime)
+        
+        listing["yaml"] = (latest[".yml"][0], counts[".yml"])
+        listing["owl"] = (latest[".owl"][0], counts[".owl"])
+        return listing
+    
     async def test_ontology_export(self):
         """Test 4: Verify ontology files are created"""
         print("\n" + "="*60)
@@ -214,25 +457,36 @@ Return ONLY valid JSON, no markdown, no explanation."""}
             print("❌ Ontology directory does not exist!")
             return False
         
-        # Find latest files
-        yaml_files = sorted(ontology_dir.glob("*.yml"), key=os.path.getmtime, reverse=True)
-        owl_files = sorted(ontology_dir.glob("*.owl"), key=os.path.getmtime, reverse=True)
+        # Find latest files (reuse the listing taken during test 2 unless an
+        # export has since added files, which bumps the directory mtime)
+        listing = self.ontology_listing
+        if listing is None or listing["mtime"] != ontology_dir.stat().st_mtime_ns:
+            listing = self._prescan_ontology_dir(ontology_dir)
+        latest_yaml, yaml_count = listing["yaml"]
+        latest_owl, owl_count = listing["owl"]
         
-        print(f"   YAML files: {len(yaml_files)}")
-        print(f"   OWL files: {len(owl_files)}")
+        print(f"   YAML files: {yaml_count}")
+        print(f"   OWL files: {owl_count}")
         
-        if not yaml_files:
+        if latest_yaml is None:
             print("❌ No YAML files found!")
             return False
         
+        # Parse the YAML and scan the OWL file on worker threads at the same
+        # time; each result (or the exception it raised) is checked below
+        yaml_result, owl_result = await asyncio.gather(
+            asyncio.to_thread(load_yaml_cached, latest_yaml),
+            asyncio.to_thread(scan_owl, latest_owl) if latest_owl is not None else asyncio.sleep(0),
+            return_exceptions=True
+        )
+        
         # Check latest YAML
-        latest_yaml = yaml_files[0]
         print(f"\n📄 Checking latest YAML: {latest_yaml.name}")
         
         try:
-            import yaml
-            with open(latest_yaml, 'r') as f:
-                data = yaml.safe_load(f)
+            if isinstance(yaml_result, Exception):
+                raise yaml_result
+            data = yaml_result
             
             concepts = data.get("concepts", [])
             properties = data.get("properties", [])
@@ -253,19 +507,19 @@ Return ONLY valid JSON, no markdown, no explanation."""}
             return False
         
         # Check latest OWL
-        if owl_files:
-            latest_owl = owl_files[0]
+        if latest_owl is not None:
             print(f"\n🦉 Checking latest OWL: {latest_owl.name}")
             
             try:
-                with open(latest_owl, 'r') as f:
-                    content = f.read()
+                if isinstance(owl_result, Exception):
+                    raise owl_result
+                counts, is_valid = owl_result
                 
                 # Basic validation
-                if '<owl:Ontology' in content and '</rdf:RDF>' in content:
+                if is_valid:
                     # Count classes
-                    class_count = content.count('<owl:Class')
-                    property_count = content.count('<owl:ObjectProperty') + content.count('<owl:DatatypeProperty')
+                    class_count = counts["Class"]
+                    property_count = counts["ObjectProperty"] + counts["DatatypeProperty"]
                     
                     print(f"   OWL Classes: {class_count}")
                     print(f"   OWL Properties: {property_count}")
@@ -287,6 +541,14 @@ Return ONLY valid JSON, no markdown, no explanation."""}
         
         return True
     
+    async def _run_test(self, name, coro):
+        """Run one test under its TEST_TIMEOUTS limit (a timeout is a failure)"""
+        try:
+            return await asyncio.wait_for(coro, timeout=TEST_TIMEOUTS[name])
+        except asyncio.TimeoutError:
+            print(f"\n❌ {name} timed out after {TEST_TIMEOUTS[name]}s")
+            return False
+    
     async def run_all_tests(self):
         """Run all tests in sequence"""
         print("\n" + "🧪 " * 20)
@@ -296,45 +558,60 @@ Return ONLY valid JSON, no markdown, no explanation."""}
         results = []
         
         # Test 1: Database connection
-        results.append(("Database Connection", await self.test_database_connection()))
+        results.append(("Database Connection",
+                        await self._run_test("Database Connection", self.test_database_connection())))
         
         if not results[0][1]:
             print("\n❌ Cannot proceed without database connection")
             return False
         
-        # Test 2: LLM structured generation
-        results.append(("LLM Structured Generation", await self.test_llm_structured_generation()))
+        # Test 2: LLM structured generation, with the ontology directory
+        # listed on a worker thread while the LLM call is in flight
+        async with asyncio.TaskGroup() as tg:
+            llm_task = tg.create_task(
+                self._run_test("LLM Structured Generation", self.test_llm_structured_generation())
+            )
+            listing_task = tg.create_task(asyncio.to_thread(self._prescan_ontology_dir))
+        self.ontology_listing = listing_task.result()
+        results.append(("LLM Structured Generation", llm_task.result()))
         
         if not results[1][1]:
             print("\n⚠️  Warning: LLM structured generation test failed")
             print("   The generate_structured method may need to be implemented")
+        elif os.getenv("RUN_LIVE_LLM") == "1":
+            # Test 2b: independent LLM stages should overlap
+            results.append(("LLM Concurrent Stages",
+                            await self._run_test("LLM Concurrent Stages", self.test_llm_concurrent_stages())))
         
         # Test 3: Ontology generation
-        results.append(("Ontology Generation", await self.test_ontology_generation()))
+        results.append(("Ontology Generation",
+                        await self._run_test("Ontology Generation", self.test_ontology_generation())))
         
         # Test 4: Export validation
-        results.append(("Ontology Export", await self.test_ontology_export()))
+        results.append(("Ontology Export",
+                        await self._run_test("Ontology Export", self.test_ontology_export())))
         
         # Summary
-        print("\n" + "="*60)
-        print("TEST SUMMARY")
-        print("="*60)
-        
-        passed = 0
-        for test_name, result in results:
-            status = "✅ PASS" if result else "❌ FAIL"
-            print(f"{status} - {test_name}")
-            if result:
-                passed += 1
-        
-        print(f"\nTotal: {passed}/{len(results)} tests passed")
-        
-        if passed == len(results):
-            print("\n🎉 All tests passed! Ontology generation is working correctly.")
-            return True
-        else:
-            print("\n⚠️  Some tests failed. Review the output above for details.")
-            return False
+        with buffered_output():
+            print("\n" + "="*60)
+            print("TEST SUMMARY")
+            print("="*60)
+        
+            passed = 0
+            for test_name, result in results:
+                status = "✅ PASS" if result else "❌ FAIL"
+                print(f"{status} - {test_name}")
+                if result:
+                    passed += 1
+        
+            print(f"\nTotal: {passed}/{len(results)} tests passed")
+        
+            if passed == len(results):
+                print("\n🎉 All tests passed! Ontology generation is working correctly.")
+                return True
+            else:
+                print("\n⚠️  Some tests failed. Review the output above for details.")
+                return False
 
 
 async def main():
@@ -353,7 +630,5 @@ if __name__ == "__main__":
         print("\n\n⚠️  Test interrupted by user")
         sys.exit(1)
     except Exception as e:
-        print(f"\n\n❌ Fatal error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("\n\n❌ Fatal error: %s", e)
         sys.exit(1)
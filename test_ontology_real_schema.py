@@ -2,6 +2,7 @@
 """
 Test ontology generation with your actual network management database
 """
+from backend.app.utils.console import buffered_output
 
 # Sample schema from your database
 sample_schema_summary = """DATABASE SCHEMA SUMMARY:
@@ -85,6 +86,15 @@ expected_concepts = [
     "NetworkAlert"
 ]
 
+# Table each expected concept is generated from
+concept_tables = {
+    "NetworkDevice": "network_devices",
+    "DeviceStatus": "device_status",
+    "HardwareInfo": "hardware_info",
+    "MaintenanceLog": "maintenance_logs",
+    "NetworkAlert": "network_alerts"
+}
+
 expected_relationships = [
     ("NetworkDevice", "DeviceStatus", "has_status"),
     ("NetworkDevice", "HardwareInfo", "uses_hardware"),
@@ -92,6 +102,7 @@ expected_relationships = [
     ("NetworkAlert", "NetworkDevice", "monitors"),
 ]
 
+
 def test_schema_content():
     """Verify the schema contains actual tables"""
     print("="*60)
@@ -114,10 +125,12 @@ def test_schema_content():
             print(f"❌ Missing table: {table}")
             return False
     
-    # Check that fake tables are NOT present
+    # Check that fake tables are NOT present (lowercase the summary once,
+    # not once per name)
     fake_tables = ["customers", "orders", "products", "departments", "employees"]
+    summary_lower = sample_schema_summary.lower()
     for table in fake_tables:
-        if table.lower() in sample_schema_summary.lower():
+        if table.lower() in summary_lower:
             print(f"❌ Should NOT contain: {table}")
             return False
     
@@ -133,7 +146,7 @@ def test_expected_concepts():
     
     for i, concept in enumerate(expected_concepts, 1):
         print(f"{i}. {concept}")
-        print(f"   Tables: {concept.lower().replace('networkdevice', 'network_devices').replace('devicestatus', 'device_status').replace('hardwareinfo', 'hardware_info').replace('maintenancelog', 'maintenance_logs').replace('networkalert', 'network_alerts')}")
+        print(f"   Tables: {concept_tables.get(concept, concept.lower())}")
     
     print("\n" + "="*60)
     print("EXPECTED RELATIONSHIPS")
@@ -175,10 +188,10 @@ def main():
     print("ONTOLOGY GENERATION - REAL SCHEMA TEST")
     print("🧪"*30 + "\n")
     
-    # Run tests
-    test_schema_content()
-    test_expected_concepts()
-    test_wrong_concepts()
+    # Run tests (each section's output is written in one go)
+    for section in (test_schema_content, test_expected_concepts, test_wrong_concepts):
+        with buffered_output():
+            section()
     
     print("\n" + "="*60)
     print("HOW TO VERIFY YOUR ONTOLOGY FILE")
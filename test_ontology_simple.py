@@ -8,6 +8,14 @@ import asyncio
 import json
 import re
 
+from backend.app.utils.console import buffered_output
+
+# JSON extraction patterns, compiled once. The fenced form can be non-greedy
+# because the closing ``` anchors it; the bare block stays greedy so it spans
+# nested brackets up to the last closing one.
+FENCED_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```", re.IGNORECASE | re.DOTALL)
+JSON_ARRAY_RE = re.compile(r"(\[.*\])", re.DOTALL)
+
 
 def test_json_parsing():
     """Test various JSON parsing strategies"""
@@ -46,7 +54,7 @@ def test_json_parsing():
     
     print("\n2️⃣ Testing fenced JSON extraction...")
     try:
-        match = re.search(r"```(?:json)?\s*(\{[\s\S]*\}|\[[\s\S]*\])\s*```", fenced_response, re.IGNORECASE)
+        match = FENCED_JSON_RE.search(fenced_response)
         if match:
             result = json.loads(match.group(1))
             print(f"✅ Fenced parse successful! Length: {len(result)}")
@@ -60,7 +68,7 @@ def test_json_parsing():
     
     print("\n3️⃣ Testing regex extraction from messy text...")
     try:
-        match = re.search(r"(\[[\s\S]*\])", messy_response)
+        match = JSON_ARRAY_RE.search(messy_response)
         if match:
             result = json.loads(match.group(1))
             print(f"✅ Regex parse successful! Length: {len(result)}")
@@ -232,11 +240,11 @@ def main():
     print("ONTOLOGY GENERATION DIAGNOSTIC TOOL")
     print("🧪" * 30)
     
-    test_json_parsing()
-    analyze_llm_response()
-    check_current_issue()
-    demonstrate_fix()
-    show_next_steps()
+    # Each section's output is written in one go
+    for section in (test_json_parsing, analyze_llm_response, check_current_issue,
+                    demonstrate_fix, show_next_steps):
+        with buffered_output():
+            section()
     
     print("\n" + "="*60)
     print("SUMMARY")
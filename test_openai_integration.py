@@ -1,13 +1,36 @@
 #!/usr/bin/env python3
 """
 Test OpenAI Integration
+
+Repeated runs reuse the response cached in .llm_test_cache/ for up to
+LLM_TEST_CACHE_TTL seconds (default one day); set LLM_TEST_NOCACHE=1 to
+always call the API.
 """
+from functools import lru_cache
+
 import yaml
 from backend.app.services.llm import LLMService
+from backend.app.utils.llm_test_cache import active_model, cached_llm_call
+from backend.app.utils.yaml_cache import YamlLoader
+
+LLM_CACHE_VERSION = "1"  # bump when the test question or schema changes
+
+
+@lru_cache(maxsize=1)
+def load_config(config_path='app_config.yml'):
+    """Load the app config once per process"""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+@lru_cache(maxsize=1)
+def get_llm_service(config_path='app_config.yml'):
+    """Build the LLMService for config_path once and share it"""
+    return LLMService(load_config(config_path))
+
 
 # Load config
-with open('app_config.yml', 'r') as f:
-    config = yaml.safe_load(f)
+config = load_config()
 
 # Test with OpenAI
 print("Testing OpenAI integration...")
@@ -17,7 +40,7 @@ print(f"OpenAI API Key (first 20 chars): {config['openai']['api_key'][:20]}...")
 
 try:
     # Create LLM service
-    llm_service = LLMService(config)
+    llm_service = get_llm_service()
     print(f"✅ LLM Service initialized successfully")
     print(f"Current provider: {llm_service.current_provider}")
     
@@ -36,9 +59,18 @@ try:
     print(f"\nTest Question: {test_question}")
     print("Generating SQL...")
     
-    result = llm_service.generate_sql(test_question, test_schema)
+    result, from_cache = cached_llm_call(
+        {"template_version": LLM_CACHE_VERSION, "provider": llm_service.current_provider,
+         "model": active_model(llm_service), "question": test_question, "schema": test_schema},
+        lambda: llm_service.generate_sql(test_question, test_schema)
+    )
     
-    print(f"\n✅ SUCCESS!")
+    if from_cache:
+        # A replayed answer says nothing about the key or the API today
+        print(f"\n⚠️  Replayed a cached response; the API was not called "
+              f"(set LLM_TEST_NOCACHE=1 to check it live)")
+    else:
+        print(f"\n✅ SUCCESS!")
     print(f"SQL: {result['sql']}")
     print(f"Explanation: {result.get('explanation', 'N/A')}")
     
@@ -5,6 +5,7 @@ Tests schema normalization and query generation
 """
 import sys
 import os
+from functools import lru_cache
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -15,7 +16,6 @@ print("=" * 80)
 
 # Test 1: Schema normalization
 print("\n1. Testing schema normalization...")
-from backend.app.services.sql_agent import SQLAgent
 
 # Mock schema in list format (how it comes from database service)
 schema_list = [
@@ -49,8 +49,17 @@ mock_config = {
     'neo4j': {'enabled': False}
 }
 
+
+@lru_cache(maxsize=1)
+def get_agent():
+    """Build the mock-backed SQLAgent (and its compiled graph) once for all tests"""
+    # Imported here so an import failure is reported by the test that needs it
+    from backend.app.services.sql_agent import SQLAgent
+    return SQLAgent(MockLLM(), MockDB(), mock_config)
+
+
 try:
-    agent = SQLAgent(MockLLM(), MockDB(), mock_config)
+    agent = get_agent()
     
     # Test normalization
     normalized = agent._normalize_schema_snapshot(schema_list)
@@ -124,7 +133,7 @@ except Exception as e:
 # Test 4: End-to-end run method
 print("\n4. Testing SQL agent run method...")
 try:
-    agent = SQLAgent(MockLLM(), MockDB(), mock_config)
+    agent = get_agent()
     
     initial_state = {
         'question': 'show all vendor names',